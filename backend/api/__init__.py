@@ -1,7 +1,11 @@
 from fastapi import APIRouter
 from backend.api.upload import router as upload_router
 from backend.api.query import router as query_router
+from backend.api.metrics import router as metrics_router
+from backend.api.sessions import router as sessions_router
 
 router = APIRouter()
 router.include_router(upload_router)
 router.include_router(query_router)
+router.include_router(metrics_router)
+router.include_router(sessions_router)
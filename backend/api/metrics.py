@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.core.admission import admission_controller
+from backend.core.sessions import session_store
+from backend.core.vectordatabase import retrieval_stats
+from backend.core.warmup import endpoint_warmer
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Expose admission, endpoint warm/cold-start, session and retrieval statistics."""
+    return {
+        "admission": admission_controller.snapshot(),
+        "endpoints": endpoint_warmer.snapshot(),
+        "sessions": session_store.snapshot(),
+        "retrieval": retrieval_stats.snapshot()
+    }
+
+@router.get("/ready")
+async def get_ready():
+    """Readiness probe: 503 until the startup endpoint warm-up has finished."""
+    snapshot = endpoint_warmer.snapshot()
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content=snapshot
+    )
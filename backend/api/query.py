@@ -7,6 +7,10 @@ from langchain_core.prompts import PromptTemplate
 from operator import itemgetter
 from ..core.vector_store import VectorStore
 from ..core.chatmodel import ChatModel
+from ..core.sessions import Session, session_store
+from ..core.warmup import endpoint_warmer
+from typing import Optional, Tuple
+import asyncio
 import os
 import json
 import re
@@ -35,6 +39,12 @@ Context:
 <|start_header_id|>assistant<|end_header_id|>
 """
 
+# Streamed ahead of the answer when an endpoint is known to be cold-starting
+WARMING_NOTICE = (
+    "_The model endpoints are waking up from idle. Your answer will start "
+    "streaming as soon as they are ready; this can take a minute or two._\n\n"
+)
+
 # Utility to clean up hallucinated or special tokens from model output
 def clean_response(text):
     # Remove only the specific hallucinated tokens
@@ -87,43 +97,101 @@ async def get_status():
         "has_content": vector_store.is_initialized and vector_store.has_content()
     }
 
+def retrieve_context(question: str, session: Optional[Session] = None) -> Tuple[str, bool]:
+    """
+    Retrieve context for a question.
+
+    Within a session, a follow-up that stays close to the session's topic reuses
+    the chunks already retrieved for it instead of searching Qdrant again.
+    Returns the context and whether cached chunks were reused. Like the
+    stateless path, an embedding failure degrades to empty context.
+    """
+    if session is None:
+        results = vector_store.search(question)
+        return "\n".join([text for text, _ in results]), False
+
+    query_vector = vector_store.embed_query(question)
+    if query_vector is None:
+        return "", False
+    reused = session_store.should_reuse(session, query_vector)
+    if reused:
+        results = session.chunks
+    else:
+        results = vector_store.search_by_vector(query_vector)
+        session.set_retrieval(query_vector, results)
+    return "\n".join([text for text, _ in results]), reused
+
 @router.post("/ask")
-async def query(question: str = Form(...)):
+async def query(question: str = Form(...), session_id: Optional[str] = Form(None)):
     print(f"[DEBUG] Received question: {question}")
+    session = None
+    if session_id:
+        # Sessions are in memory and expire, so an unknown id (after idle
+        # expiry, eviction or a restart) starts a fresh session instead of
+        # failing the question; X-Session-Id tells the client which one
+        session = session_store.get(session_id) or session_store.create()
+    history = session.history(session_store.history_token_budget) if session else None
+    session_headers = {"X-Session-Id": session.id} if session else {}
+
     try:
         # Get the RAG chain
         vector_store.try_initialize_from_qdrant()  # Ensure vector_db is initialized if Qdrant has data
         if not vector_store.is_initialized:
             # If no vector store, return empty context message
-            response = chat_model.run(question, "")
-            return JSONResponse(content={"response": clean_response(response)})
+            response = clean_response(chat_model.run(question, "", history))
+            if session:
+                session.add_turn(question, response)
+            return JSONResponse(content={"response": response}, headers=session_headers)
 
-        # Get relevant context from vector store
-        results = vector_store.search(question)
-        context = "\n".join([text for text, _ in results])
+        headers = {
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Transfer-Encoding": "chunked",
+            **session_headers
+        }
+        warming = bool(endpoint_warmer.warming_endpoints())
+        context = None
+        if not warming:
+            # Get relevant context from vector store
+            context, reused = retrieve_context(question, session)
+            if session:
+                headers["X-Retrieval-Reused"] = "true" if reused else "false"
 
         async def response_stream():
+            nonlocal context
+            answer = []
+            if warming:
+                # Tell the user what is happening before blocking on a cold
+                # embedding endpoint, then retrieve off the event loop
+                yield WARMING_NOTICE
+                try:
+                    context, _ = await asyncio.to_thread(retrieve_context, question, session)
+                except Exception as e:
+                    endpoint_warmer.observe_error("embedding", e)
+                    yield json.dumps({"error": str(e)})
+                    return
             try:
-                async for chunk in chat_model.astream(question, context):
+                async for chunk in chat_model.astream(question, context, history):
                     cleaned = clean_response(chunk)
                     if cleaned:
+                        answer.append(cleaned)
                         yield cleaned
             except Exception as e:
+                endpoint_warmer.observe_error("llm", e)
                 # Send error as a JSON chunk
                 error_msg = json.dumps({"error": str(e)})
                 yield error_msg
+                return
+            if session:
+                session.add_turn(question, "".join(answer))
 
         return StreamingResponse(
             response_stream(),
             media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Transfer-Encoding": "chunked"
-            }
+            headers=headers
         )
     except Exception as e:
         return JSONResponse(
             status_code=500,
             content={"error": str(e)}
-        ) 
\ No newline at end of file
+        )
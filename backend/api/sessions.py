@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.core.sessions import session_store
+
+router = APIRouter()
+
+@router.post("/sessions")
+async def create_session():
+    """Start a conversation session; pass its id to /ask as `session_id`."""
+    session = session_store.create()
+    return {
+        "session_id": session.id,
+        "ttl_seconds": session_store.ttl
+    }
+
+@router.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Return a session's recent turns and cached retrieval size."""
+    session = session_store.get(session_id)
+    if session is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown or expired session"})
+    return session.snapshot()
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """End a session and drop its history and cached chunks."""
+    if not session_store.delete(session_id):
+        return JSONResponse(status_code=404, content={"error": "Unknown or expired session"})
+    return {"deleted": session_id}
@@ -0,0 +1,147 @@
+"""
+Local chunk store search benchmark.
+
+Loads the same random vectors into two collections on a local Qdrant: one with
+chunk text in the payload, and one without, with the text kept in a local
+``ChunkStore``. Then compares the search response size and end-to-end latency
+(search + text fetch) of the two paths.
+
+Start a local Qdrant first:
+    docker run -p 6333:6333 qdrant/qdrant
+
+Usage:
+    python -m backend.benchmarks.chunk_store_search --points 20000 --chunk-chars 1000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from typing import Callable, List
+
+import httpx
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from qdrant_client.http.models import Distance, VectorParams
+
+from backend.core.chunk_store import ChunkStore
+from backend.core.vectordatabase import BulkWriter
+
+
+def random_vectors(rng: np.random.Generator, count: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load_collections(
+    client: QdrantClient, store: ChunkStore, names: List[str],
+    num_points: int, dim: int, chunk_chars: int
+):
+    rng = np.random.default_rng(0)
+    filler = ("lorem ipsum dolor sit amet " * (chunk_chars // 27 + 1))[:chunk_chars]
+    for name in names:
+        client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE)
+        )
+
+    with BulkWriter(client, names[0], wait_for_index=True) as with_text, \
+            BulkWriter(client, names[1], wait_for_index=True, chunk_store=store) as ids_only:
+        for start in range(0, num_points, 1024):
+            vectors = random_vectors(rng, min(1024, num_points - start), dim)
+            ids = list(range(start, start + len(vectors)))
+            texts = [f"{point_id} {filler}" for point_id in ids]
+            # The second writer moves each text into the chunk store
+            for writer in (with_text, ids_only):
+                writer.write(
+                    models.PointStruct(id=i, vector=v.tolist(), payload={"text": t})
+                    for i, v, t in zip(ids, vectors, texts)
+                )
+
+
+def response_bytes(url: str, name: str, vector: np.ndarray, k: int, with_payload: bool) -> int:
+    """Size of the raw REST search response body."""
+    response = httpx.post(
+        f"{url}/collections/{name}/points/search",
+        json={"vector": vector.tolist(), "limit": k, "with_payload": with_payload},
+    )
+    response.raise_for_status()
+    return len(response.content)
+
+
+def time_queries(fn: Callable[[np.ndarray], object], queries: np.ndarray) -> List[float]:
+    fn(queries[0])  # warm-up
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search with a local chunk store")
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--chunk-chars", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url)
+    suffix = uuid.uuid4().hex[:8]
+    names = [f"bench-payload-{suffix}", f"bench-ids-{suffix}"]
+    queries = random_vectors(np.random.default_rng(1), args.queries, args.dim)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = ChunkStore(store_dir)
+        try:
+            load_collections(client, store, names, args.points, args.dim, args.chunk_chars)
+
+            def payload_search(query):
+                hits = client.search(
+                    collection_name=names[0], query_vector=query.tolist(), limit=args.k
+                )
+                return [hit.payload["text"] for hit in hits]
+
+            def store_search(query):
+                hits = client.search(
+                    collection_name=names[1], query_vector=query.tolist(), limit=args.k,
+                    with_payload=False
+                )
+                texts = store.get_many([hit.id for hit in hits])
+                return [texts[str(hit.id)] for hit in hits]
+
+            results = {
+                "payload": (
+                    response_bytes(args.url, names[0], queries[0], args.k, True),
+                    time_queries(payload_search, queries),
+                ),
+                "chunk store": (
+                    response_bytes(args.url, names[1], queries[0], args.k, False),
+                    time_queries(store_search, queries),
+                ),
+            }
+        finally:
+            store.close()
+            for name in names:
+                client.delete_collection(name)
+
+    print(
+        f"{args.points} points, {args.chunk_chars}-char chunks, k={args.k}, "
+        f"{args.queries} queries"
+    )
+    for label, (size, timings) in results.items():
+        timings.sort()
+        print(
+            f"{label:<12} response {size:>7} B  "
+            f"p50 {statistics.median(timings):6.2f} ms  "
+            f"p95 {timings[int(0.95 * (len(timings) - 1))]:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Embedding throughput benchmark.
+
+Measures how many chunks per second each registered embedding backend can embed.
+
+Usage:
+    python -m backend.benchmarks.embedding_throughput --backends hashing huggingface
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from dotenv import load_dotenv
+
+from backend.core.embeddings import EMBEDDING_BACKENDS, get_embedding_backend
+
+WORDS = (
+    "field dream deploy vector query answer model endpoint document chunk search "
+    "baseball corn iowa player season retrieval context embedding latency index"
+).split()
+
+
+def make_corpus(num_texts: int, words_per_text: int, seed: int = 0) -> List[str]:
+    """Generate a deterministic synthetic corpus of space-separated words."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(words_per_text))
+        for _ in range(num_texts)
+    ]
+
+
+def run_benchmark(backend_name: str, texts: List[str], batch_size: int) -> None:
+    try:
+        backend = get_embedding_backend(backend_name)
+    except Exception as e:
+        print(f"{backend_name:<12} skipped: {e}")
+        return
+
+    # Warm up once so connection setup / caches are not counted
+    backend.embed_documents(texts[:batch_size])
+
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        backend.embed_documents(texts[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{backend_name:<12} dim={backend.dimension:<5} "
+        f"{len(texts) / elapsed:>10.1f} chunks/s  "
+        f"{elapsed * 1000 / max(1, len(texts) // batch_size):>8.2f} ms/batch"
+    )
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--backends", nargs="+", default=sorted(EMBEDDING_BACKENDS),
+        help="Backends to benchmark (default: all registered backends)",
+    )
+    parser.add_argument("--num-texts", type=int, default=2048)
+    parser.add_argument("--words-per-text", type=int, default=180)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.num_texts, args.words_per_text)
+    print(
+        f"Embedding {len(texts)} chunks of {args.words_per_text} words "
+        f"in batches of {args.batch_size}"
+    )
+    for backend_name in args.backends:
+        run_benchmark(backend_name, texts, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Qdrant bulk write benchmark.
+
+Compares the legacy write path (blocking upserts of 32 points with HNSW indexing
+left on) against ``BulkWriter`` (large non-blocking batches, parallel uploads,
+deferred indexing) on a local Qdrant. Random unit vectors are used so no
+embedding calls are made. Both timings include waiting until the collection is
+fully indexed.
+
+Start a local Qdrant first:
+    docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant
+
+Usage:
+    python -m backend.benchmarks.qdrant_bulk_write --points 50000 --grpc
+"""
+
+import argparse
+import time
+import uuid
+from typing import Iterator, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from qdrant_client.http.models import CollectionStatus, Distance, VectorParams
+
+from backend.core.vectordatabase import BulkWriter
+
+
+def make_points(num_points: int, dim: int, seed: int = 0) -> Iterator[models.PointStruct]:
+    """Yield points with random unit vectors and a small text payload."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_points, 1024):
+        count = min(1024, num_points - start)
+        vectors = rng.standard_normal((count, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for offset, vector in enumerate(vectors):
+            yield models.PointStruct(
+                id=start + offset,
+                vector=vector.tolist(),
+                payload={"text": f"chunk {start + offset}"}
+            )
+
+
+def collection_exists(client: QdrantClient, name: str) -> bool:
+    return name in [c.name for c in client.get_collections().collections]
+
+
+def recreate_collection(client: QdrantClient, name: str, dim: int):
+    if collection_exists(client, name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(size=dim, distance=Distance.COSINE)
+    )
+
+
+def wait_until_green(client: QdrantClient, name: str):
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(0.2)
+
+
+def legacy_write(client: QdrantClient, name: str, num_points: int, dim: int):
+    batch: List[models.PointStruct] = []
+    for point in make_points(num_points, dim):
+        batch.append(point)
+        if len(batch) == 32:
+            client.upsert(collection_name=name, points=batch)
+            batch = []
+    if batch:
+        client.upsert(collection_name=name, points=batch)
+    wait_until_green(client, name)
+
+
+def bulk_write(
+    client: QdrantClient, name: str, num_points: int, dim: int,
+    batch_size: int, parallel: int
+):
+    with BulkWriter(
+        client, name, batch_size=batch_size, parallel=parallel, wait_for_index=True
+    ) as writer:
+        writer.write(make_points(num_points, dim))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant bulk write paths")
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--grpc", action="store_true", help="Use the gRPC transport")
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=4)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, prefer_grpc=args.grpc)
+    name = f"bench-bulk-write-{uuid.uuid4().hex[:8]}"
+    print(
+        f"Writing {args.points} x {args.dim}-d points to {args.url} "
+        f"({'gRPC' if args.grpc else 'REST'})"
+    )
+
+    timings = {}
+    try:
+        recreate_collection(client, name, args.dim)
+        start = time.perf_counter()
+        legacy_write(client, name, args.points, args.dim)
+        timings["legacy"] = time.perf_counter() - start
+
+        recreate_collection(client, name, args.dim)
+        start = time.perf_counter()
+        bulk_write(client, name, args.points, args.dim, args.batch_size, args.parallel)
+        timings["bulk"] = time.perf_counter() - start
+
+        count = client.count(collection_name=name, exact=True).count
+        assert count == args.points, f"expected {args.points} points, found {count}"
+    finally:
+        if collection_exists(client, name):
+            client.delete_collection(name)
+
+    for label, elapsed in timings.items():
+        print(f"{label:<8} {elapsed:>8.2f}s  {args.points / elapsed:>10.1f} points/s")
+    print(f"speedup  {timings['legacy'] / timings['bulk']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
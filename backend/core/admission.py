@@ -0,0 +1,281 @@
+"""
+Admission control and priority load shedding for expensive API routes.
+
+Each controlled route belongs to a lane with its own concurrency limit; all lanes
+also share a global limit. Requests that cannot start immediately wait in a
+single bounded queue that is served in priority order (interactive asks before
+uploads). When the queue is full a new request either evicts the lowest-priority
+waiter, if it outranks it, or is rejected straight away with 429 and
+``Retry-After``. Waiters that exceed the queue timeout get 503.
+
+Batch work such as the indexer CLI (``python -m backend.indexer``) runs in its
+own process and is not subject to admission control.
+"""
+
+import asyncio
+import itertools
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+
+INTERACTIVE = "interactive"
+UPLOAD = "upload"
+
+ROUTE_LANES = {
+    "/api/ask": INTERACTIVE,
+    "/api/upload": UPLOAD,
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, status_code: int, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class Lane:
+    """
+    Concurrency limit and counters for one class of work.
+
+    Lanes with a lower ``priority`` value are served first.
+    """
+
+    def __init__(self, name: str, priority: int, limit: int):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.evicted = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: Deque[float] = deque(maxlen=1000)
+
+    def record_wait(self, seconds: float):
+        self.admitted += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self.recent_waits.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.recent_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "priority": self.priority,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+            "timed_out": self.timed_out,
+            "wait_seconds": {
+                "mean": self.total_wait / self.admitted if self.admitted else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": self.max_wait,
+            },
+        }
+
+
+class _Waiter:
+    def __init__(self, lane: Lane, seq: int, future: asyncio.Future):
+        self.lane = lane
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def sort_key(self):
+        return (self.lane.priority, self.seq)
+
+
+class AdmissionController:
+    """
+    Priority admission controller shared by all requests on the event loop.
+
+    Configured from the environment:
+
+    - ``ADMISSION_MAX_CONCURRENCY``: requests running across all lanes (default 10)
+    - ``ADMISSION_ASK_CONCURRENCY``: concurrent ``/api/ask`` streams (default 8)
+    - ``ADMISSION_UPLOAD_CONCURRENCY``: concurrent uploads (default 2)
+    - ``ADMISSION_QUEUE_SIZE``: waiting requests across all lanes (default 32)
+    - ``ADMISSION_QUEUE_TIMEOUT``: seconds a request may wait (default 30)
+    - ``ADMISSION_RETRY_AFTER``: ``Retry-After`` seconds on rejection (default 5)
+    """
+
+    def __init__(self):
+        self.max_concurrency = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "10"))
+        self.max_queue = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+        self.queue_timeout = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+        self.retry_after = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+        self.lanes: Dict[str, Lane] = {
+            INTERACTIVE: Lane(INTERACTIVE, 0, int(os.getenv("ADMISSION_ASK_CONCURRENCY", "8"))),
+            UPLOAD: Lane(UPLOAD, 1, int(os.getenv("ADMISSION_UPLOAD_CONCURRENCY", "2"))),
+        }
+        self.in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+
+    def lane_for_path(self, path: str) -> Optional[str]:
+        """Lane controlling ``path``, or None if the route is not controlled."""
+        return ROUTE_LANES.get(path.rstrip("/"))
+
+    def _can_run(self, lane: Lane) -> bool:
+        return self.in_flight < self.max_concurrency and lane.in_flight < lane.limit
+
+    def _start(self, lane: Lane):
+        self.in_flight += 1
+        lane.in_flight += 1
+
+    def _remove(self, waiter: _Waiter):
+        self._waiters.remove(waiter)
+        waiter.lane.queued -= 1
+
+    def _retry_after(self) -> int:
+        # Never suggest retrying sooner than the median recent queue wait
+        waits = [w for lane in self.lanes.values() for w in lane.recent_waits]
+        typical = sorted(waits)[len(waits) // 2] if waits else 0.0
+        return max(self.retry_after, math.ceil(typical))
+
+    async def acquire(self, lane_name: str):
+        """
+        Wait for a slot in ``lane_name``.
+
+        Raises
+        ------
+        AdmissionRejected
+            If the queue is full (429) or the wait times out (503).
+        """
+        lane = self.lanes[lane_name]
+        if self._can_run(lane):
+            self._start(lane)
+            lane.record_wait(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            # With ADMISSION_QUEUE_SIZE=0 there is never a waiter to displace
+            worst = max(self._waiters, key=lambda w: w.sort_key, default=None)
+            if worst is None or worst.lane.priority <= lane.priority:
+                lane.rejected += 1
+                raise AdmissionRejected(
+                    "Server is busy, please retry shortly", 429, self._retry_after()
+                )
+            # Shed the lowest-priority waiter to make room for this request
+            self._remove(worst)
+            worst.lane.evicted += 1
+            worst.future.set_exception(AdmissionRejected(
+                "Request shed for higher-priority work, please retry shortly",
+                429,
+                self._retry_after(),
+            ))
+
+        waiter = _Waiter(lane, next(self._seq), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        lane.queued += 1
+
+        try:
+            done, _ = await asyncio.wait({waiter.future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot granted meanwhile
+            if waiter.future.done() and not waiter.future.exception():
+                self.release(lane_name)
+            elif waiter in self._waiters:
+                self._remove(waiter)
+            raise
+
+        if not done:
+            self._remove(waiter)
+            waiter.future.cancel()
+            lane.timed_out += 1
+            raise AdmissionRejected(
+                "Timed out waiting for capacity, please retry shortly",
+                503,
+                self._retry_after(),
+            )
+        # Re-raises AdmissionRejected if this waiter was evicted
+        waiter.future.result()
+        lane.record_wait(time.monotonic() - waiter.enqueued_at)
+
+    def release(self, lane_name: str):
+        """Free a slot and hand it to the highest-priority eligible waiter."""
+        lane = self.lanes[lane_name]
+        self.in_flight -= 1
+        lane.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        for waiter in sorted(self._waiters, key=lambda w: w.sort_key):
+            if self.in_flight >= self.max_concurrency:
+                break
+            if self._can_run(waiter.lane):
+                self._remove(waiter)
+                self._start(waiter.lane)
+                waiter.future.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits, queue depths and wait-time statistics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "max_queue": self.max_queue,
+            "queue_depth": len(self._waiters),
+            "queue_timeout_seconds": self.queue_timeout,
+            "lanes": {name: lane.snapshot() for name, lane in self.lanes.items()},
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that admits controlled routes through an ``AdmissionController``.
+
+    Implemented at the ASGI level rather than with ``@app.middleware("http")`` so
+    the slot is held until a streamed response body has been fully sent.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        lane = None
+        if scope["type"] == "http" and scope["method"] != "OPTIONS":
+            lane = self.controller.lane_for_path(scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(lane)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"error": e.reason},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(lane)
+
+
+admission_controller = AdmissionController()
@@ -6,7 +6,7 @@ Includes:
 """
 
 import os
-from typing import AsyncGenerator, List, Dict, Any
+from typing import AsyncGenerator, List, Dict, Any, Optional, Tuple
 from langchain_community.llms import HuggingFaceEndpoint
 from langchain.schema import HumanMessage, SystemMessage
 
@@ -25,16 +25,32 @@ class ChatModel:
         if not self.api_key:
             raise ValueError("HF_API_KEY environment variable is required")
 
-    def _format_prompt(self, query: str, context: str = "") -> str:
+    def _format_prompt(
+        self, query: str, context: str = "", history: Optional[List[Tuple[str, str]]] = None
+    ) -> str:
         """
         Format the prompt using Llama 3 template format.
+
+        ``history`` holds earlier (question, answer) turns, oldest first, and is
+        rendered as prior user/assistant messages.
         """
         system_message = "You are a helpful AI assistant. Use the provided context to answer questions accurately and concisely."
-        
+
+        previous_turns = "".join(
+            f"""<|start_header_id|>user<|end_header_id|>
+{question}<|eot_id|>
+
+<|start_header_id|>assistant<|end_header_id|>
+{answer}<|eot_id|>
+
+"""
+            for question, answer in (history or [])
+        )
+
         prompt = f"""<|start_header_id|>system<|end_header_id|>
 {system_message}<|eot_id|>
 
-<|start_header_id|>user<|end_header_id|>
+{previous_turns}<|start_header_id|>user<|end_header_id|>
 User Query:
 {query}
 
@@ -45,7 +61,9 @@ Context:
         
         return prompt
 
-    def run(self, query: str, context: str = "") -> str:
+    def run(
+        self, query: str, context: str = "", history: Optional[List[Tuple[str, str]]] = None
+    ) -> str:
         """
         Synchronously run a prompt against the chat model.
         """
@@ -61,11 +79,25 @@ Context:
             repetition_penalty=1.03
         )
         
-        prompt = self._format_prompt(query, context)
+        prompt = self._format_prompt(query, context, history)
         response = llm.invoke(prompt)
         return response
 
-    async def astream(self, query: str, context: str = "") -> AsyncGenerator[str, None]:
+    def warmup(self) -> str:
+        """
+        Send a one-token generation to wake the endpoint up.
+        """
+        llm = HuggingFaceEndpoint(
+            endpoint_url=self.endpoint_url,
+            huggingfacehub_api_token=self.api_key,
+            task="text-generation",
+            max_new_tokens=1
+        )
+        return llm.invoke("ping")
+
+    async def astream(
+        self, query: str, context: str = "", history: Optional[List[Tuple[str, str]]] = None
+    ) -> AsyncGenerator[str, None]:
         """
         Asynchronously stream response chunks for a given prompt.
         """
@@ -82,7 +114,7 @@ Context:
             streaming=True
         )
         
-        prompt = self._format_prompt(query, context)
+        prompt = self._format_prompt(query, context, history)
         
         async for chunk in llm.astream(prompt):
             if isinstance(chunk, str):
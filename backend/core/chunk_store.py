@@ -0,0 +1,186 @@
+"""
+Local chunk text store keyed by Qdrant point ID.
+
+When enabled (``CHUNK_STORE_PATH``), chunk text is kept out of Qdrant payloads:
+texts are appended to ``chunks.dat`` and their (offset, length) recorded in a
+SQLite index, ``chunks.sqlite``. Searches then run with ``with_payload=False``
+and the hit texts are fetched locally in one batched, offset-ordered read, with
+a small LRU cache in front for hot chunks.
+
+The data file is append-only; re-storing an ID appends the new text and points
+the index at it. Several processes (e.g. the indexer CLI and the server) may
+share a store, so cached texts are keyed by their offset and every lookup
+checks the index: a chunk rewritten by another process has moved and is
+re-read.
+
+Writes are not fsynced one by one; ``sync()`` makes everything written so far
+durable and is called at the ``BulkWriter`` consistency barrier.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DATA_FILE = "chunks.dat"
+INDEX_FILE = "chunks.sqlite"
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_SQL_BATCH = 500
+
+_stores: Dict[str, "ChunkStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def get_chunk_store(path: Optional[str] = None) -> Optional["ChunkStore"]:
+    """
+    Shared ``ChunkStore`` for ``path`` (default ``CHUNK_STORE_PATH``), or None
+    when the local chunk store is not configured.
+    """
+    path = path or os.getenv("CHUNK_STORE_PATH")
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ChunkStore(path)
+        return _stores[path]
+
+
+class ChunkStore:
+    """
+    Append-only chunk text file with a SQLite offset index and an LRU cache.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding ``chunks.dat`` and ``chunks.sqlite`` (created if missing).
+    cache_size : int, optional
+        Number of chunk texts kept in memory (default ``CHUNK_STORE_CACHE_SIZE``
+        or 4096).
+    """
+
+    def __init__(self, directory: str, cache_size: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.cache_size = cache_size or int(os.getenv("CHUNK_STORE_CACHE_SIZE", "4096"))
+        # point ID -> (offset, text); the offset identifies which version is cached
+        self._cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        data_path = os.path.join(directory, DATA_FILE)
+        self._writer = open(data_path, "ab")
+        self._reader = open(data_path, "rb")
+        self._db = sqlite3.connect(
+            os.path.join(directory, INDEX_FILE), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # No fsync per commit in WAL mode; sync() checkpoints at the barrier
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id TEXT PRIMARY KEY, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        self._db.commit()
+
+    def put_many(self, items: Iterable[Tuple[Union[int, str], str]]):
+        """
+        Append ``(point_id, text)`` pairs and index them in one transaction.
+
+        The texts are visible to readers straight away but only durable after
+        ``sync()``.
+        """
+        encoded = [(str(point_id), text.encode("utf-8")) for point_id, text in items]
+        if not encoded:
+            return
+
+        with self._lock:
+            if fcntl is not None:
+                # Other processes (e.g. the indexer CLI) may append concurrently
+                fcntl.flock(self._writer.fileno(), fcntl.LOCK_EX)
+            try:
+                self._writer.seek(0, os.SEEK_END)
+                offset = self._writer.tell()
+                rows = []
+                for point_id, data in encoded:
+                    rows.append((point_id, offset, len(data)))
+                    offset += len(data)
+                self._writer.write(b"".join(data for _, data in encoded))
+                self._writer.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._writer.fileno(), fcntl.LOCK_UN)
+
+            self._db.executemany(
+                "INSERT OR REPLACE INTO chunks (id, offset, length) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+            for point_id, _ in encoded:
+                self._cache.pop(point_id, None)
+
+    def get_many(self, point_ids: Sequence[Union[int, str]]) -> Dict[str, str]:
+        """
+        Fetch texts for ``point_ids``, keyed by ``str(point_id)``.
+
+        IDs that are not in the store are omitted from the result.
+        """
+        keys = list(dict.fromkeys(str(point_id) for point_id in point_ids))
+        found: Dict[str, str] = {}
+        with self._lock:
+            # Always consult the index: another process may have moved a chunk
+            locations: List[Tuple[str, int, int]] = []
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = keys[i:i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                locations.extend(self._db.execute(
+                    f"SELECT id, offset, length FROM chunks WHERE id IN ({placeholders})",
+                    batch,
+                ))
+
+            misses = []
+            for key, offset, length in locations:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] == offset:
+                    self._cache.move_to_end(key)
+                    found[key] = cached[1]
+                else:
+                    misses.append((key, offset, length))
+
+            # Read in file order so the batch is one forward pass over the file
+            for key, offset, length in sorted(misses, key=lambda row: row[1]):
+                self._reader.seek(offset)
+                data = self._reader.read(length)
+                if len(data) != length:
+                    # Indexed ahead of data lost before a sync(); treat as missing
+                    continue
+                text = data.decode("utf-8")
+                found[key] = text
+                self._cache[key] = (offset, text)
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return found
+
+    def sync(self):
+        """Flush appended texts and their index entries to disk."""
+        with self._lock:
+            # Data before index, so a durable entry never points past the file
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._writer.close()
+            self._reader.close()
+            self._db.close()
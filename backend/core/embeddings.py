@@ -1,37 +1,247 @@
 """
-Embedding model provider using HuggingFace Inference Endpoints.
+Embedding model providers.
 
-This implementation uses HuggingFace Inference Endpoints for generating vector embeddings.
+Embeddings are produced by a pluggable backend selected with the
+``EMBEDDING_BACKEND`` environment variable:
+
+- ``huggingface`` (default): HuggingFace Inference Endpoints
+- ``hashing``: local CPU feature-hashing embeddings built with NumPy, useful for
+  development, offline benchmarks and as a degraded-mode fallback
+
+Additional backends can be added with ``register_embedding_backend``.
 """
 
 import os
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
+import re
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple, Type
 
-class EmbeddingProvider:
+import numpy as np
+
+EMBEDDING_BACKENDS: Dict[str, Type["EmbeddingBackend"]] = {}
+
+DEFAULT_EMBEDDING_BACKEND = "huggingface"
+
+
+def register_embedding_backend(
+    name: str,
+) -> Callable[[Type["EmbeddingBackend"]], Type["EmbeddingBackend"]]:
+    """
+    Class decorator that registers an embedding backend under ``name``.
+
+    Parameters
+    ----------
+    name : str
+        The value of ``EMBEDDING_BACKEND`` that selects this backend.
+    """
+
+    def decorator(cls: Type["EmbeddingBackend"]) -> Type["EmbeddingBackend"]:
+        cls.name = name
+        EMBEDDING_BACKENDS[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_embedding_backend(name: Optional[str] = None) -> "EmbeddingBackend":
+    """
+    Instantiate an embedding backend from the registry.
+
+    Parameters
+    ----------
+    name : str, optional
+        Registered backend name. Defaults to the ``EMBEDDING_BACKEND``
+        environment variable, then to ``huggingface``.
+
+    Returns
+    -------
+    EmbeddingBackend
+        A ready-to-use backend instance.
     """
-    Handles generation of vector embeddings using HuggingFace Inference Endpoints.
-    
+    name = (name or os.getenv("EMBEDDING_BACKEND") or DEFAULT_EMBEDDING_BACKEND).lower()
+    if name not in EMBEDDING_BACKENDS:
+        available = ", ".join(sorted(EMBEDDING_BACKENDS))
+        raise ValueError(
+            f"Unknown embedding backend '{name}'. Available backends: {available}"
+        )
+    return EMBEDDING_BACKENDS[name]()
+
+
+class EmbeddingBackend:
+    """
+    Base class for embedding backends.
+
     Attributes
     ----------
-    model : HuggingFaceEndpointEmbeddings
-        An instance of the HuggingFace embeddings model.
+    name : str
+        Registry name of the backend.
+    dimension : int
+        Length of the vectors produced by the backend.
+    model_id : str
+        Identity of the underlying model; vectors from backends with different
+        model ids are not comparable.
+    """
+
+    name = ""
+    dimension = 0
+    model_id = ""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def embed_query(self, query: str) -> List[float]:
+        raise NotImplementedError
+
+
+@register_embedding_backend("huggingface")
+class HuggingFaceEmbeddingBackend(EmbeddingBackend):
+    """
+    Embeddings generated remotely by a HuggingFace Inference Endpoint.
+
+    The vector dimension is read from ``HF_EMBEDDING_DIMENSION`` (default 768)
+    and the model identity from ``HF_EMBEDDING_MODEL_NAME`` (default: the
+    endpoint URL).
     """
 
     def __init__(self):
+        # Imported lazily so the local backends work without langchain-huggingface
+        from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
         self.api_key = os.getenv("HF_API_KEY")
         self.endpoint_url = os.getenv("HF_EMBEDDING_ENDPOINT_URL")
-        
+
         if not self.endpoint_url:
             raise ValueError("HF_EMBEDDING_ENDPOINT_URL environment variable is required")
         if not self.api_key:
             raise ValueError("HF_API_KEY environment variable is required")
-            
+
+        self.dimension = int(os.getenv("HF_EMBEDDING_DIMENSION", "768"))
+        # Name the model explicitly so vectors stay comparable across endpoint URLs
+        model_name = os.getenv("HF_EMBEDDING_MODEL_NAME") or self.endpoint_url
+        self.model_id = f"huggingface:{model_name}"
         self.model = HuggingFaceEndpointEmbeddings(
             model=self.endpoint_url,
             task="feature-extraction",
             huggingfacehub_api_token=self.api_key
         )
 
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, query: str) -> List[float]:
+        return self.model.embed_query(query)
+
+
+@register_embedding_backend("hashing")
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Local CPU embeddings based on signed feature hashing.
+
+    Word unigrams and bigrams are hashed into ``dimension`` buckets with a random
+    sign, term frequencies are log-scaled (``sign(x) * log1p(|x|)``) as in
+    sublinear TF-IDF, and rows are L2-normalised so cosine similarity behaves
+    like a TF-IDF comparison. No vocabulary or IDF table is fitted, which keeps
+    vectors stable across processes and over the lifetime of a collection.
+
+    The dimension is read from ``HASHING_EMBEDDING_DIMENSION`` (default 768).
+    """
+
+    _token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dimension: Optional[int] = None):
+        self.dimension = dimension or int(os.getenv("HASHING_EMBEDDING_DIMENSION", "768"))
+        if self.dimension <= 0:
+            raise ValueError("HASHING_EMBEDDING_DIMENSION must be a positive integer")
+        self.model_id = f"hashing-v1:{self.dimension}"
+        # Memoised token -> (bucket, sign); crc32 is stable across processes
+        # unlike the builtin hash(), which is salted per interpreter.
+        self._feature_cache: Dict[str, Tuple[int, float]] = {}
+
+    def _features(self, text: str) -> List[str]:
+        tokens = self._token_pattern.findall(text.lower())
+        bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return tokens + bigrams
+
+    def _hash_feature(self, feature: str) -> Tuple[int, float]:
+        cached = self._feature_cache.get(feature)
+        if cached is None:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            cached = (digest % self.dimension, 1.0 if (digest >> 31) & 1 else -1.0)
+            if len(self._feature_cache) < 1_000_000:
+                self._feature_cache[feature] = cached
+        return cached
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts into a ``(len(texts), dimension)`` float32 array.
+
+        Parameters
+        ----------
+        texts : list of str
+            The texts to embed.
+
+        Returns
+        -------
+        numpy.ndarray
+            L2-normalised embedding matrix.
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        signs: List[float] = []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                col, sign = self._hash_feature(feature)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if rows:
+            np.add.at(
+                matrix,
+                (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+                np.asarray(signs, dtype=np.float32),
+            )
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, query: str) -> List[float]:
+        return self.embed_array([query])[0].tolist()
+
+
+class EmbeddingProvider:
+    """
+    Handles generation of vector embeddings through the configured backend.
+
+    Attributes
+    ----------
+    model : EmbeddingBackend
+        The active embedding backend.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.model = get_embedding_backend(backend)
+
+    @property
+    def backend_name(self) -> str:
+        """Registry name of the active backend."""
+        return self.model.name
+
+    @property
+    def dimension(self) -> int:
+        """Length of the vectors produced by the active backend."""
+        return self.model.dimension
+
+    @property
+    def model_id(self) -> str:
+        """Identity of the model behind the active backend."""
+        return self.model.model_id
+
     def embed_documents(self, texts):
         """
         Generate vector embeddings for a list of text chunks.
@@ -0,0 +1,171 @@
+"""
+In-memory conversation sessions for multi-turn /api/ask.
+
+A session keeps its recent turns and the chunks retrieved for the current topic.
+A follow-up question whose embedding stays close to the query that produced
+those chunks reuses them instead of searching Qdrant again. History passed to
+the LLM is trimmed to a token budget.
+"""
+
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+class Session:
+    """
+    Conversation state for one client.
+
+    Attributes
+    ----------
+    turns : list of (str, str)
+        Recent (question, answer) pairs, oldest first.
+    chunks : list of (str, float)
+        Chunks retrieved for the current topic, with relevance scores.
+    topic_vector : numpy.ndarray or None
+        Normalised embedding of the query that retrieved ``chunks``.
+    """
+
+    def __init__(self, max_turns: int):
+        self.id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.last_access = time.monotonic()
+        self.max_turns = max_turns
+        self.turns: List[Tuple[str, str]] = []
+        self.chunks: List[Tuple[str, float]] = []
+        self.topic_vector: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def topic_similarity(self, query_vector) -> Optional[float]:
+        """Cosine similarity between ``query_vector`` and the session topic."""
+        if self.topic_vector is None or not self.chunks:
+            return None
+        return float(np.dot(self.topic_vector, self._normalize(query_vector)))
+
+    def set_retrieval(self, query_vector, chunks: List[Tuple[str, float]]):
+        """Cache freshly retrieved chunks and anchor the topic on their query."""
+        self.topic_vector = self._normalize(query_vector)
+        self.chunks = list(chunks)
+
+    def add_turn(self, question: str, answer: str):
+        self.turns.append((question, answer))
+        del self.turns[:-self.max_turns]
+
+    def history(self, token_budget: int) -> List[Tuple[str, str]]:
+        """Most recent turns whose combined size fits in ``token_budget`` tokens."""
+        kept = []
+        used = 0
+        for question, answer in reversed(self.turns):
+            cost = estimate_tokens(question) + estimate_tokens(answer)
+            if used + cost > token_budget:
+                break
+            kept.append((question, answer))
+            used += cost
+        kept.reverse()
+        return kept
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "created_at": self.created_at,
+            "turns": [{"question": q, "answer": a} for q, a in self.turns],
+            "cached_chunks": len(self.chunks),
+        }
+
+
+class SessionStore:
+    """
+    LRU session store with idle TTL and a size bound.
+
+    Configured from the environment:
+
+    - ``SESSION_TTL_SECONDS``: idle time before a session expires (default 1800)
+    - ``SESSION_MAX_SESSIONS``: sessions kept before evicting the least recently
+      used (default 1000)
+    - ``SESSION_MAX_TURNS``: turns kept per session (default 20)
+    - ``SESSION_HISTORY_TOKEN_BUDGET``: history tokens sent to the LLM (default 1024)
+    - ``SESSION_REUSE_THRESHOLD``: cosine similarity to the session topic above
+      which cached chunks are reused (default 0.8)
+    """
+
+    def __init__(self):
+        self.ttl = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+        self.max_sessions = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+        self.max_turns = int(os.getenv("SESSION_MAX_TURNS", "20"))
+        self.history_token_budget = int(os.getenv("SESSION_HISTORY_TOKEN_BUDGET", "1024"))
+        self.reuse_threshold = float(os.getenv("SESSION_REUSE_THRESHOLD", "0.8"))
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.retrieval_reused = 0
+        self.retrieval_searched = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _purge(self):
+        # Ordered by last access, so expired sessions are at the front
+        now = time.monotonic()
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def create(self) -> Session:
+        session = Session(self.max_turns)
+        self._sessions[session.id] = session
+        self._purge()
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return a live session and mark it as recently used, or None."""
+        self._purge()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def should_reuse(self, session: Session, query_vector) -> bool:
+        """Whether ``session``'s cached chunks can answer this follow-up."""
+        similarity = session.topic_similarity(query_vector)
+        reuse = similarity is not None and similarity >= self.reuse_threshold
+        if reuse:
+            self.retrieval_reused += 1
+        else:
+            self.retrieval_searched += 1
+        return reuse
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "retrieval_reused": self.retrieval_reused,
+            "retrieval_searched": self.retrieval_searched,
+        }
+
+
+session_store = SessionStore()
@@ -0,0 +1,134 @@
+"""
+Compact collection snapshots for warm starts and migrations.
+
+A snapshot is a directory holding:
+
+- ``vectors.npy``: float32 matrix of shape (count, dimension), memory-mappable
+- ``payloads.jsonl``: one ``{"id": ..., "payload": {...}}`` line per vector row
+- ``manifest.json``: embedding model identity, dimension, count and checksums
+
+Snapshots are written and read by ``VectorDatabase.export_snapshot`` and
+``VectorDatabase.import_snapshot``; importing re-uses the stored vectors, so no
+embedding calls are made.
+
+Usage:
+    python -m backend.core.snapshot export snapshots/2024-05-01
+    python -m backend.core.snapshot import snapshots/2024-05-01
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Tuple, Union
+
+import numpy as np
+
+SNAPSHOT_FORMAT_VERSION = 1
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Stream a file through SHA-256."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def open_vectors_for_write(directory: str, count: int, dimension: int) -> np.memmap:
+    """Create ``vectors.npy`` as a writable memory map of the final shape."""
+    os.makedirs(directory, exist_ok=True)
+    return np.lib.format.open_memmap(
+        os.path.join(directory, VECTORS_FILE),
+        mode="w+",
+        dtype=np.float32,
+        shape=(count, dimension),
+    )
+
+
+def write_manifest(directory: str, **fields: Any) -> Dict[str, Any]:
+    """Checksum the data files and write ``manifest.json``."""
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **fields,
+        "files": {
+            name: {
+                "sha256": file_sha256(os.path.join(directory, name)),
+                "bytes": os.path.getsize(os.path.join(directory, name)),
+            }
+            for name in (VECTORS_FILE, PAYLOADS_FILE)
+        },
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory: str, verify_checksums: bool = True) -> Dict[str, Any]:
+    """Load ``manifest.json`` and optionally verify the data file checksums."""
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {manifest.get('format_version')}"
+        )
+    if verify_checksums:
+        for name, expected in manifest["files"].items():
+            actual = file_sha256(os.path.join(directory, name))
+            if actual != expected["sha256"]:
+                raise ValueError(f"Checksum mismatch for {name} in snapshot {directory}")
+    return manifest
+
+
+def iter_snapshot_points(
+    directory: str, manifest: Dict[str, Any]
+) -> Iterator[Tuple[Union[int, str], np.ndarray, Dict[str, Any]]]:
+    """Yield ``(id, vector, payload)`` rows, reading vectors through a memory map."""
+    vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+    if vectors.shape != (manifest["count"], manifest["dimension"]):
+        raise ValueError(
+            f"vectors.npy has shape {vectors.shape}, manifest expects "
+            f"({manifest['count']}, {manifest['dimension']})"
+        )
+
+    with open(os.path.join(directory, PAYLOADS_FILE), "r", encoding="utf-8") as f:
+        for row, line in enumerate(f):
+            record = json.loads(line)
+            yield record["id"], vectors[row], record["payload"]
+
+
+def main():
+    from dotenv import load_dotenv
+
+    from backend.core.vectordatabase import VectorDatabase
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Export or import a collection snapshot")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("directory", help="Snapshot directory")
+    parser.add_argument(
+        "--skip-checksums", action="store_true",
+        help="Do not verify file checksums on import",
+    )
+    args = parser.parse_args()
+
+    vector_db = VectorDatabase()
+    if args.action == "export":
+        manifest = vector_db.export_snapshot(args.directory)
+        print(f"Exported {manifest['count']} points to {args.directory}")
+    else:
+        count = vector_db.import_snapshot(
+            args.directory, verify_checksums=not args.skip_checksums
+        )
+        print(f"Imported {count} points from {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ Text processing utilities for loading and handling documents.
 """
 
 import os
-from typing import List
+from typing import Iterator, List
 import PyPDF2
 
+SUPPORTED_EXTENSIONS = (".txt", ".pdf")
+
 class TextFileLoader:
     """
     Loads text content from .txt files or directories containing .txt files.
@@ -66,6 +68,38 @@ class PDFLoader:
         return self.documents
 
 
+def iter_corpus_files(path: str) -> Iterator[str]:
+    """
+    Lazily yield supported files under ``path`` in a stable (sorted) order.
+
+    ``path`` may be a single file or a directory that is walked recursively.
+    """
+    if os.path.isfile(path):
+        if path.endswith(SUPPORTED_EXTENSIONS):
+            yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(SUPPORTED_EXTENSIONS):
+                yield os.path.join(root, file)
+
+
+def load_file_documents(path: str, encoding: str = "utf-8") -> List[str]:
+    """
+    Load the documents of a single .txt or .pdf file.
+
+    Defined at module level so it can be shipped to worker processes.
+    """
+    if path.endswith(".pdf"):
+        loader = PDFLoader(path)
+        loader.load()
+        # Pages without a text layer come back as None/empty
+        return [page for page in loader.documents if page]
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        return [f.read()]
+
+
 class CharacterTextSplitter:
     def __init__(
         self,
@@ -1,5 +1,7 @@
+import asyncio
 from backend.core.vectordatabase import VectorDatabase
 from backend.core.text_utils import PDFLoader, TextFileLoader, CharacterTextSplitter
+from backend.core.warmup import endpoint_warmer
 from langchain.schema.retriever import BaseRetriever
 from typing import List, Dict, Any
 from pydantic import Field
@@ -22,6 +24,11 @@ class VectorStore:
 
     async def process_file(self, file_path: str, is_pdf: bool) -> int:
         """Process a file and store its chunks in the vector database"""
+        # Parsing and embedding block, so run them off the event loop to keep
+        # admitted /api/ask streams responsive during uploads
+        return await asyncio.to_thread(self._process_file_sync, file_path, is_pdf)
+
+    def _process_file_sync(self, file_path: str, is_pdf: bool) -> int:
         loader = PDFLoader(file_path) if is_pdf else TextFileLoader(file_path)
         documents = loader.load_documents()
         chunks = self.splitter.split_texts(documents)
@@ -36,28 +43,52 @@ class VectorStore:
         if self.vector_db is None:
             print("[DEBUG] VectorStore.search: vector_db is None")
             return []
+        # Embed separately so endpoint failures are reported against the embedding endpoint
+        query_vector = self.embed_query(query)
+        if query_vector is None:
+            return []
+        return self.search_by_vector(query_vector, k=k)
+
+    def embed_query(self, query: str):
+        """Embed a query with the vector database's embedding backend, or None on failure"""
+        if self.vector_db is None:
+            return None
         try:
-            # Get search results from the vector database
-            results = self.vector_db.search_by_text(query, k=k)
-            print(f"[DEBUG] Raw search results: {results}")
-            # Ensure we're returning a list of tuples with (text, score)
-            processed_results = []
-            for result in results:
-                if isinstance(result, tuple) and len(result) == 2:
-                    doc, score = result
-                    # Fix: handle both Document and str
-                    if hasattr(doc, 'page_content'):
-                        processed_results.append((str(doc.page_content), score))
-                    else:
-                        processed_results.append((str(doc), score))
-                else:
-                    processed_results.append((str(result), 1.0))
-            print(f"[DEBUG] Processed search results: {processed_results}")
-            return processed_results
+            return self.vector_db.embedding_provider.embed_query(query)
+        except Exception as e:
+            print(f"Error embedding query: {e}")
+            endpoint_warmer.observe_error("embedding", e)
+            return None
+
+    def search_by_vector(self, query_vector, k: int = 4):
+        """Search the vector database with a precomputed query embedding"""
+        if self.vector_db is None:
+            print("[DEBUG] VectorStore.search_by_vector: vector_db is None")
+            return []
+        try:
+            results = self.vector_db.search_by_vector(query_vector, k=k)
+            return self._process_results(results)
         except Exception as e:
             print(f"Error in vector store search: {e}")
             return []
 
+    def _process_results(self, results):
+        print(f"[DEBUG] Raw search results: {results}")
+        # Ensure we're returning a list of tuples with (text, score)
+        processed_results = []
+        for result in results:
+            if isinstance(result, tuple) and len(result) == 2:
+                doc, score = result
+                # Fix: handle both Document and str
+                if hasattr(doc, 'page_content'):
+                    processed_results.append((str(doc.page_content), score))
+                else:
+                    processed_results.append((str(doc), score))
+            else:
+                processed_results.append((str(result), 1.0))
+        print(f"[DEBUG] Processed search results: {processed_results}")
+        return processed_results
+
     def as_retriever(self) -> BaseRetriever:
         """Convert the vector store into a LangChain retriever."""
         return VectorStoreRetriever(vector_store=self)
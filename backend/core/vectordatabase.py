@@ -2,12 +2,240 @@
 Vector database handler for storing and retrieving text chunks using Qdrant.
 """
 
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import CollectionStatus, Distance, VectorParams
+from backend.core import snapshot
+from backend.core.chunk_store import ChunkStore, get_chunk_store
 from backend.core.embeddings import EmbeddingProvider
+import json
+import numpy as np
 import os
+import threading
+import time
+
+# Payload field holding the file a chunk came from (set by the bulk indexer)
+SOURCE_FIELD = "source"
+
+# Missing point IDs listed in the warning and kept for /api/metrics
+MAX_REPORTED_MISSING_IDS = 10
+
+
+class RetrievalStats:
+    """
+    Counters for search hits whose chunk text could not be found.
+
+    A hit has no text when it is in neither its Qdrant payload nor the local
+    chunk store, e.g. the indexer wrote to a ``CHUNK_STORE_PATH`` the server
+    does not share. Such hits are dropped from the results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.hits = 0
+        self.missing_text = 0
+        self.recent_missing_ids: List[str] = []
+
+    def record(self, hits: int, missing_ids: List[Union[int, str]]):
+        with self._lock:
+            self.searches += 1
+            self.hits += hits
+            self.missing_text += len(missing_ids)
+            if missing_ids:
+                recent = self.recent_missing_ids + [str(i) for i in missing_ids]
+                self.recent_missing_ids = recent[-MAX_REPORTED_MISSING_IDS:]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "hits": self.hits,
+                "hits_missing_text": self.missing_text,
+                "recent_missing_ids": list(self.recent_missing_ids),
+            }
+
+
+retrieval_stats = RetrievalStats()
+
+
+class BulkWriter:
+    """
+    High-throughput writer for bulk loads into a Qdrant collection.
+
+    Points are buffered into large batches that are upserted by a thread pool
+    with ``wait=False``, so Qdrant acknowledges each batch as soon as it is
+    written to its WAL. ``sync()`` (and closing the writer) acts as a
+    consistency barrier: it waits for every outstanding request, then re-sends
+    the last point with ``wait=True``. Qdrant applies updates in order, so once
+    that returns all earlier writes have been applied.
+
+    With a ``chunk_store``, each point's payload ``text`` is moved into the
+    store as its batch is submitted, before Qdrant sees the ID, and the store
+    is made durable at each ``sync()``.
+
+    With ``defer_indexing`` the collection's HNSW indexing threshold is set to 0
+    for the duration of the load so Qdrant does not rebuild the graph while
+    points stream in; the previous threshold is restored on close. If the
+    threshold is already 0, because another load is deferring indexing or an
+    operator configured it that way, the writer leaves it alone: only the
+    writer that changed it restores it.
+
+    Use as a context manager::
+
+        with BulkWriter(client, "collection") as writer:
+            writer.write(points)
+
+    Parameters
+    ----------
+    client : QdrantClient
+        Client to write with; use ``prefer_grpc=True`` for the gRPC transport.
+    collection_name : str
+        Target collection.
+    batch_size : int, optional
+        Points per upsert request (default ``QDRANT_UPSERT_BATCH_SIZE`` or 256).
+    parallel : int, optional
+        Concurrent upsert requests (default ``QDRANT_UPLOAD_PARALLEL`` or 4).
+    defer_indexing : bool, optional
+        Disable HNSW indexing while the writer is open (default True).
+    wait_for_index : bool, optional
+        On close, block until the collection is green again (default False).
+    chunk_store : ChunkStore, optional
+        Local store that receives chunk text instead of the Qdrant payload.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        parallel: Optional[int] = None,
+        defer_indexing: bool = True,
+        wait_for_index: bool = False,
+        index_timeout: float = 600.0,
+        chunk_store: Optional[ChunkStore] = None,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = batch_size or int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+        self.parallel = parallel or int(os.getenv("QDRANT_UPLOAD_PARALLEL", "4"))
+        self.defer_indexing = defer_indexing
+        self.wait_for_index = wait_for_index
+        self.index_timeout = index_timeout
+        self.chunk_store = chunk_store
+        self.points_written = 0
+
+        self._buffer: List[models.PointStruct] = []
+        self._futures: Deque[Future] = deque()
+        self._last_point: Optional[models.PointStruct] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._saved_indexing_threshold: Optional[int] = None
+        self._closed = False
+
+    def __enter__(self) -> "BulkWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(flush=exc_type is None)
+
+    def open(self):
+        """Start the upload pool and, if requested, defer index optimization."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.parallel, thread_name_prefix="qdrant-bulk"
+        )
+        if self.defer_indexing:
+            info = self.client.get_collection(collection_name=self.collection_name)
+            threshold = info.config.optimizer_config.indexing_threshold
+            if threshold:
+                self._saved_indexing_threshold = threshold
+                self._set_indexing_threshold(0)
+            else:
+                # Another load owns the threshold, or a crashed one left it at 0
+                print(f"[INFO] Indexing already deferred on '{self.collection_name}'; "
+                      "leaving the threshold to whoever set it")
+
+    def write(self, points: Iterable[models.PointStruct]):
+        """Queue points for upload, sending every full batch."""
+        for point in points:
+            self._buffer.append(point)
+            if len(self._buffer) >= self.batch_size:
+                self._submit()
+
+    def sync(self):
+        """Send buffered points and block until every write has been applied."""
+        if self._buffer:
+            self._submit()
+        self._drain(0)
+        if self.chunk_store is not None:
+            self.chunk_store.sync()
+        if self._last_point is not None:
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=[self._last_point],
+                wait=True
+            )
+
+    def close(self, flush: bool = True):
+        """Sync outstanding writes and restore index optimization."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if flush:
+                self.sync()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            if self._saved_indexing_threshold is not None:
+                self._set_indexing_threshold(self._saved_indexing_threshold)
+                if self.wait_for_index:
+                    self._wait_until_green()
+
+    def _submit(self):
+        batch, self._buffer = self._buffer, []
+        if self.chunk_store is not None:
+            self.chunk_store.put_many(
+                (point.id, point.payload.pop("text"))
+                for point in batch if point.payload and "text" in point.payload
+            )
+        # Bound in-flight requests so a fast producer cannot buffer the corpus
+        self._drain(self.parallel * 2 - 1)
+        self._futures.append(self._executor.submit(self._upsert, batch))
+        self._last_point = batch[-1]
+        self.points_written += len(batch)
+
+    def _upsert(self, batch: List[models.PointStruct]):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=batch,
+            wait=False
+        )
+
+    def _drain(self, max_pending: int):
+        while len(self._futures) > max_pending:
+            # result() re-raises upload errors in the caller's thread
+            self._futures.popleft().result()
+
+    def _set_indexing_threshold(self, threshold: int):
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=threshold)
+        )
+
+    def _wait_until_green(self):
+        deadline = time.monotonic() + self.index_timeout
+        while time.monotonic() < deadline:
+            info = self.client.get_collection(collection_name=self.collection_name)
+            if info.status == CollectionStatus.GREEN:
+                return
+            time.sleep(0.5)
+        print(f"[WARN] Collection '{self.collection_name}' still optimizing after "
+              f"{self.index_timeout:.0f}s")
+
 
 class VectorDatabase:
     """
@@ -16,13 +244,22 @@ class VectorDatabase:
 
     def __init__(self):
         self.embedding_provider = EmbeddingProvider()
-        self.collection_name = "s15-field-of-dreams"
-        self.vector_size = 768  # Hugging Face embedding dimension
+        self.collection_name = os.getenv("QDRANT_COLLECTION_NAME", "s15-field-of-dreams")
+        self.vector_size = self.embedding_provider.dimension
         
         # Initialize Qdrant client
         self.client = QdrantClient(
             url=os.getenv("QDRANT_URL"),
-            api_key=os.getenv("QDRANT_API_KEY")
+            api_key=os.getenv("QDRANT_API_KEY"),
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true",
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        )
+        # Optional local chunk text store; when set, Qdrant payloads omit the text
+        self.chunk_store = get_chunk_store()
+
+        # Loads at least this large defer HNSW indexing until they finish
+        self.defer_indexing_min_points = int(
+            os.getenv("QDRANT_DEFER_INDEXING_MIN_POINTS", "10000")
         )
         
         # Create collection if it doesn't exist
@@ -42,6 +279,34 @@ class VectorDatabase:
                     distance=Distance.COSINE
                 )
             )
+            self._ensure_source_index()
+            return
+
+        # Vectors from a backend with a different dimension cannot be stored here
+        info = self.client.get_collection(collection_name=self.collection_name)
+        if SOURCE_FIELD not in (info.payload_schema or {}):
+            self._ensure_source_index()
+        vectors_config = info.config.params.vectors
+        existing_size = getattr(vectors_config, "size", None)
+        if existing_size is not None and existing_size != self.vector_size:
+            raise ValueError(
+                f"Collection '{self.collection_name}' stores {existing_size}-dimensional "
+                f"vectors but the '{self.embedding_provider.backend_name}' embedding "
+                f"backend produces {self.vector_size}. Set QDRANT_COLLECTION_NAME to "
+                "use a separate collection for this backend."
+            )
+
+    def _ensure_source_index(self):
+        """
+        Index the ``source`` payload field so the indexer can delete a changed
+        file's chunks without scanning the whole collection.
+        """
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=SOURCE_FIELD,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+            wait=True
+        )
 
     def abuild_from_list(self, chunks: List[str]):
         """
@@ -52,30 +317,185 @@ class VectorDatabase:
         chunks : list of str
             The list of preprocessed text segments.
         """
-        # Process chunks in batches of 32 (Hugging Face endpoint limit)
-        batch_size = 32
-        points = []
-        
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
+        self.upsert_texts(chunks, ids=list(range(len(chunks))))
+
+    def bulk_writer(self, **kwargs) -> BulkWriter:
+        """
+        Create a ``BulkWriter`` for this collection.
+
+        Keyword arguments are passed through to ``BulkWriter``. Chunk text goes
+        to the local chunk store when one is configured.
+        """
+        kwargs.setdefault("chunk_store", self.chunk_store)
+        return BulkWriter(self.client, self.collection_name, **kwargs)
+
+    def upsert_texts(
+        self,
+        texts: Sequence[str],
+        ids: Sequence[Union[int, str]],
+        payloads: Optional[Sequence[Dict[str, Any]]] = None,
+        batch_size: int = 32,
+        writer: Optional[BulkWriter] = None,
+    ):
+        """
+        Embed text chunks and upsert them under the given point IDs.
+
+        Parameters
+        ----------
+        texts : sequence of str
+            The text segments to embed and store.
+        ids : sequence of int or str
+            Qdrant point IDs (unsigned integers or UUID strings), one per text.
+        payloads : sequence of dict, optional
+            Extra payload fields stored alongside each chunk's ``text``.
+        batch_size : int, optional
+            Number of chunks per embedding request (default is 32, the
+            Hugging Face endpoint limit).
+        writer : BulkWriter, optional
+            An open writer shared across calls. The caller owns it and must
+            ``sync()``/close it before relying on the points being applied.
+            Without one, a writer is opened and closed around this call.
+        """
+        if len(ids) != len(texts):
+            raise ValueError("upsert_texts requires exactly one id per text")
+
+        if writer is not None:
+            self._write_texts(writer, texts, ids, payloads, batch_size)
+            return
+
+        defer_indexing = len(texts) >= self.defer_indexing_min_points
+        with self.bulk_writer(defer_indexing=defer_indexing) as writer:
+            self._write_texts(writer, texts, ids, payloads, batch_size)
+
+    def _write_texts(
+        self,
+        writer: BulkWriter,
+        texts: Sequence[str],
+        ids: Sequence[Union[int, str]],
+        payloads: Optional[Sequence[Dict[str, Any]]],
+        batch_size: int,
+    ):
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
             # Generate embeddings for the current batch
-            embeddings = self.embedding_provider.model.embed_documents(batch)
-            
-            # Prepare points for the current batch
+            embeddings = self.embedding_provider.embed_documents(list(batch))
+
+            points = []
             for j, (text, embedding) in enumerate(zip(batch, embeddings)):
+                # The writer moves text into the chunk store when one is configured
+                payload = {"text": text}
+                if payloads is not None:
+                    payload.update(payloads[i + j])
                 points.append(models.PointStruct(
-                    id=i + j,  # Ensure unique IDs across batches
+                    id=ids[i + j],
                     vector=embedding,
-                    payload={"text": text}
+                    payload=payload
                 ))
-            
-            # Upload points to Qdrant after each batch
-            if points:
-                self.client.upsert(
+            writer.write(points)
+
+    def export_snapshot(self, directory: str, batch_size: int = 1024) -> Dict[str, Any]:
+        """
+        Export the collection to a compact local snapshot.
+
+        Vectors are written to a memory-mapped ``vectors.npy`` and payloads to
+        ``payloads.jsonl``; ``manifest.json`` records the embedding model
+        identity, dimension and file checksums. See ``backend.core.snapshot``.
+
+        Parameters
+        ----------
+        directory : str
+            Destination directory (created if missing).
+        batch_size : int, optional
+            Points fetched per scroll request (default is 1024).
+
+        Returns
+        -------
+        dict
+            The written manifest.
+        """
+        count = self.client.count(collection_name=self.collection_name, exact=True).count
+        vectors = snapshot.open_vectors_for_write(directory, count, self.vector_size)
+
+        row = 0
+        offset = None
+        with open(os.path.join(directory, snapshot.PAYLOADS_FILE), "w", encoding="utf-8") as f:
+            while True:
+                points, offset = self.client.scroll(
                     collection_name=self.collection_name,
-                    points=points
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True
                 )
-                points = []  # Clear points for next batch
+                if row + len(points) > count:
+                    raise RuntimeError(
+                        f"Collection '{self.collection_name}' changed during export"
+                    )
+                if points:
+                    vectors[row:row + len(points)] = np.asarray(
+                        [point.vector for point in points], dtype=np.float32
+                    )
+                    # Snapshots are self-contained: fold locally stored text back in
+                    texts = self._fetch_texts(points)
+                    for point in points:
+                        payload = dict(point.payload or {})
+                        if "text" not in payload and str(point.id) in texts:
+                            payload["text"] = texts[str(point.id)]
+                        f.write(json.dumps({"id": point.id, "payload": payload}) + "\n")
+                    row += len(points)
+                if offset is None:
+                    break
+
+        if row != count:
+            raise RuntimeError(f"Collection '{self.collection_name}' changed during export")
+        vectors.flush()
+        del vectors
+
+        return snapshot.write_manifest(
+            directory,
+            collection=self.collection_name,
+            embedding_backend=self.embedding_provider.backend_name,
+            model_id=self.embedding_provider.model_id,
+            dimension=self.vector_size,
+            distance=Distance.COSINE.value,
+            count=count,
+        )
+
+    def import_snapshot(self, directory: str, verify_checksums: bool = True) -> int:
+        """
+        Bulk-load a snapshot written by ``export_snapshot`` without re-embedding.
+
+        Parameters
+        ----------
+        directory : str
+            Snapshot directory.
+        verify_checksums : bool, optional
+            Verify the data file checksums before loading (default is True).
+
+        Returns
+        -------
+        int
+            Number of points imported.
+        """
+        manifest = snapshot.read_manifest(directory, verify_checksums=verify_checksums)
+        if manifest["model_id"] != self.embedding_provider.model_id:
+            raise ValueError(
+                f"Snapshot was embedded with '{manifest['model_id']}' but the active "
+                f"embedding model is '{self.embedding_provider.model_id}'"
+            )
+        if manifest["dimension"] != self.vector_size:
+            raise ValueError(
+                f"Snapshot stores {manifest['dimension']}-dimensional vectors but the "
+                f"collection uses {self.vector_size}"
+            )
+
+        defer_indexing = manifest["count"] >= self.defer_indexing_min_points
+        with self.bulk_writer(defer_indexing=defer_indexing) as writer:
+            writer.write(
+                models.PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+                for point_id, vector, payload in snapshot.iter_snapshot_points(directory, manifest)
+            )
+        return manifest["count"]
 
     def search_by_text(self, query: str, k: int = 4) -> List[Tuple[str, float]]:
         """
@@ -94,20 +514,76 @@ class VectorDatabase:
             List of matched chunks with relevance scores.
         """
         # Generate embedding for the query
-        query_embedding = self.embedding_provider.model.embed_query(query)
-        
-        # Search in Qdrant
+        query_embedding = self.embedding_provider.embed_query(query)
+        return self.search_by_vector(query_embedding, k=k)
+
+    def search_by_vector(self, query_embedding: List[float], k: int = 4) -> List[Tuple[str, float]]:
+        """
+        Search the vector database with a precomputed query embedding.
+
+        Parameters
+        ----------
+        query_embedding : list of float
+            Embedding of the query from the active embedding backend.
+        k : int, optional
+            The number of top matches to return (default is 4).
+
+        Returns
+        -------
+        list of tuple
+            List of matched chunks with relevance scores.
+        """
+        # Search in Qdrant; with a local chunk store only IDs and scores come back
         search_result = self.client.search(
             collection_name=self.collection_name,
             query_vector=query_embedding,
-            limit=k
+            limit=k,
+            with_payload=self.chunk_store is None
         )
-        
+        texts = self._fetch_texts(search_result)
+
         # Format results
         results = []
+        missing = []
         for scored_point in search_result:
-            text = scored_point.payload["text"]
+            text = texts.get(str(scored_point.id))
+            if text is None:
+                missing.append(scored_point.id)
+                continue
             score = scored_point.score
             results.append((text, score))
-        
+
+        retrieval_stats.record(len(search_result), missing)
+        if missing:
+            store = self.chunk_store.directory if self.chunk_store is not None else "not configured"
+            print(f"[WARN] {len(missing)} of {len(search_result)} search hits have no text in "
+                  f"their payload or the chunk store ({store}); check that the server "
+                  f"and indexer share CHUNK_STORE_PATH. Missing IDs: "
+                  f"{missing[:MAX_REPORTED_MISSING_IDS]}")
         return results
+
+    def _fetch_texts(self, points) -> Dict[str, str]:
+        """
+        Chunk texts for Qdrant points, keyed by ``str(point.id)``.
+
+        Uses the payload when present, then the local chunk store. Points written
+        before the chunk store was enabled fall back to a payload fetch.
+        """
+        texts = {
+            str(point.id): point.payload["text"]
+            for point in points
+            if point.payload and "text" in point.payload
+        }
+        missing = [point.id for point in points if str(point.id) not in texts]
+        if missing and self.chunk_store is not None:
+            texts.update(self.chunk_store.get_many(missing))
+            missing = [point_id for point_id in missing if str(point_id) not in texts]
+        if missing:
+            for record in self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=missing,
+                with_payload=["text"]
+            ):
+                if record.payload and "text" in record.payload:
+                    texts[str(record.id)] = record.payload["text"]
+        return texts
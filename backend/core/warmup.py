@@ -0,0 +1,259 @@
+"""
+Warm-keeping for scale-to-zero HuggingFace Inference Endpoints.
+
+``EndpointWarmer`` runs as a background task for the lifetime of the app. At
+startup it sends a tiny embedding and a one-token generation to each endpoint,
+retrying until they answer, before ``/api/ready`` reports ready. Afterwards it
+pings the endpoints on a schedule during business hours so they do not scale to
+zero while people are using the app, and tracks cold-start events.
+
+An endpoint is considered warming when a probe fails with a "loading"/503 style
+error, or when a probe has been in flight longer than the cold-start threshold.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+UNKNOWN = "unknown"
+WARMING = "warming"
+READY = "ready"
+ERROR = "error"
+
+# Substrings of errors HF endpoints return while scaled to zero or starting up
+COLD_START_MARKERS = ("503", "loading", "initializing", "scaled to zero", "paused")
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _parse_days(spec: str) -> List[int]:
+    """Parse ``mon-fri`` / ``mon,wed,fri`` into weekday numbers (Monday is 0)."""
+    days = []
+    for part in spec.lower().split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = (DAY_NAMES.index(p.strip()[:3]) for p in part.split("-", 1))
+            days.extend(range(start, end + 1))
+        elif part:
+            days.append(DAY_NAMES.index(part[:3]))
+    return days
+
+
+def _parse_hours(spec: str) -> tuple:
+    """Parse ``08:00-18:00`` into ((8, 0), (18, 0))."""
+    start, end = spec.split("-", 1)
+    return tuple(tuple(int(x) for x in t.strip().split(":", 1)) for t in (start, end))
+
+
+class EndpointState:
+    """Health and cold-start counters for one endpoint."""
+
+    def __init__(self, name: str, probe: Callable[[], Any]):
+        self.name = name
+        self.probe = probe
+        self.status = UNKNOWN
+        self.cold_starts = 0
+        self.pings = 0
+        self.failures = 0
+        self.last_latency: Optional[float] = None
+        self.last_ping_at: Optional[float] = None
+        self.last_ready_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.probe_started_at: Optional[float] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "cold_starts": self.cold_starts,
+            "pings": self.pings,
+            "failures": self.failures,
+            "last_latency_seconds": self.last_latency,
+            "last_ping_at": self.last_ping_at,
+            "last_ready_at": self.last_ready_at,
+            "last_error": self.last_error,
+        }
+
+
+class EndpointWarmer:
+    """
+    Background warmer for the LLM and embedding endpoints.
+
+    Configured from the environment:
+
+    - ``WARMER_ENABLED``: set to ``false`` to disable pings (default true)
+    - ``WARMER_INTERVAL_SECONDS``: seconds between pings in business hours (default 300)
+    - ``WARMER_BUSINESS_HOURS``: local time window, e.g. ``08:00-18:00``
+    - ``WARMER_BUSINESS_DAYS``: e.g. ``mon-fri`` (default)
+    - ``WARMER_TIMEZONE``: IANA timezone for the window (default UTC)
+    - ``WARMER_COLD_START_SECONDS``: probe latency treated as a cold start (default 10)
+    - ``WARMER_RETRY_SECONDS``: ping interval while an endpoint is warming (default 15)
+    - ``WARMER_STARTUP_TIMEOUT``: give up waiting for endpoints at startup and
+      report ready anyway after this many seconds (default 600)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("WARMER_ENABLED", "true").lower() != "false"
+        self.interval = float(os.getenv("WARMER_INTERVAL_SECONDS", "300"))
+        self.business_hours = _parse_hours(os.getenv("WARMER_BUSINESS_HOURS", "08:00-18:00"))
+        self.business_days = _parse_days(os.getenv("WARMER_BUSINESS_DAYS", "mon-fri"))
+        timezone_name = os.getenv("WARMER_TIMEZONE", "UTC")
+        # Avoid needing the tz database (missing on slim images) for the default
+        self.timezone = timezone.utc if timezone_name.upper() == "UTC" else ZoneInfo(timezone_name)
+        self.cold_start_threshold = float(os.getenv("WARMER_COLD_START_SECONDS", "10"))
+        self.retry_interval = float(os.getenv("WARMER_RETRY_SECONDS", "15"))
+        self.startup_timeout = float(os.getenv("WARMER_STARTUP_TIMEOUT", "600"))
+
+        self.endpoints: Dict[str, EndpointState] = {}
+        self.ready = not self.enabled
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(self, name: str, probe: Callable[[], Any]):
+        """Register a blocking ``probe`` that sends a minimal request to an endpoint."""
+        self.endpoints[name] = EndpointState(name, probe)
+
+    async def start(self):
+        """Start the warm-up and keep-warm loop in the background."""
+        if self.enabled and self.endpoints and self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        else:
+            self.ready = True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+
+    def is_warming(self, name: str) -> bool:
+        """Whether ``name`` is known to be cold-starting right now."""
+        state = self.endpoints.get(name)
+        if state is None:
+            return False
+        if state.status == WARMING:
+            return True
+        started = state.probe_started_at
+        return started is not None and time.monotonic() - started > self.cold_start_threshold
+
+    def warming_endpoints(self) -> List[str]:
+        return [name for name in self.endpoints if self.is_warming(name)]
+
+    def observe_error(self, name: str, error: Exception):
+        """
+        Record a cold-start error seen outside the warmer, e.g. during /api/ask.
+
+        Safe to call from worker threads such as ``asyncio.to_thread`` retrieval.
+        """
+        state = self.endpoints.get(name)
+        if state is not None and self._is_cold_start_error(error):
+            self._mark_warming(state, str(error))
+            loop = self._loop
+            if loop is not None and not loop.is_closed():
+                # asyncio.Event is not thread-safe; set it on the warmer's loop
+                loop.call_soon_threadsafe(self._wake.set)
+
+    def in_business_hours(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(self.timezone)
+        (start_h, start_m), (end_h, end_m) = self.business_hours
+        minutes = now.hour * 60 + now.minute
+        return (
+            now.weekday() in self.business_days
+            and start_h * 60 + start_m <= minutes < end_h * 60 + end_m
+        )
+
+    async def _run(self):
+        await self._startup()
+        while True:
+            warming = [s for s in self.endpoints.values() if s.status == WARMING]
+            if warming:
+                # Keep polling endpoints that are waking up until they answer
+                await asyncio.sleep(self.retry_interval)
+                await asyncio.gather(*(self._ping(s) for s in warming))
+                continue
+
+            try:
+                # Woken early when /api/ask reports a cold start
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+                self._wake.clear()
+                continue
+            except asyncio.TimeoutError:
+                pass
+            if self.in_business_hours():
+                await asyncio.gather(*(self._ping(s) for s in self.endpoints.values()))
+
+    async def _startup(self):
+        deadline = time.monotonic() + self.startup_timeout
+        pending = list(self.endpoints.values())
+        while pending:
+            results = await asyncio.gather(*(self._ping(s) for s in pending))
+            pending = [s for s, ok in zip(pending, results) if not ok]
+            if not pending or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(self.retry_interval)
+
+        if pending:
+            names = ", ".join(s.name for s in pending)
+            print(f"[WARMER] Startup warm-up timed out for: {names}")
+        self.ready = True
+
+    async def _ping(self, state: EndpointState) -> bool:
+        state.pings += 1
+        state.probe_started_at = time.monotonic()
+        try:
+            await asyncio.to_thread(state.probe)
+        except Exception as e:
+            state.failures += 1
+            if self._is_cold_start_error(e):
+                self._mark_warming(state, str(e))
+            else:
+                state.status = ERROR
+                state.last_error = str(e)
+            print(f"[WARMER] {state.name} ping failed ({state.status}): {e}")
+            return False
+        finally:
+            state.last_latency = time.monotonic() - state.probe_started_at
+            state.last_ping_at = time.time()
+            state.probe_started_at = None
+
+        if state.status != WARMING and state.last_latency > self.cold_start_threshold:
+            # Woke up without ever returning a loading error
+            state.cold_starts += 1
+            print(f"[WARMER] {state.name} cold start took {state.last_latency:.1f}s")
+        state.status = READY
+        state.last_error = None
+        state.last_ready_at = time.time()
+        return True
+
+    def _mark_warming(self, state: EndpointState, error: str):
+        if state.status != WARMING:
+            state.cold_starts += 1
+            print(f"[WARMER] {state.name} is cold-starting")
+        state.status = WARMING
+        state.last_error = error
+
+    @staticmethod
+    def _is_cold_start_error(error: Exception) -> bool:
+        message = str(error).lower()
+        return any(marker in message for marker in COLD_START_MARKERS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Readiness and per-endpoint status, latency and cold-start counts."""
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "in_business_hours": self.in_business_hours(),
+            "endpoints": {name: s.snapshot() for name, s in self.endpoints.items()},
+        }
+
+
+endpoint_warmer = EndpointWarmer()
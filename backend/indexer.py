@@ -0,0 +1,393 @@
+"""
+Bulk corpus indexer.
+
+Walks directories of .txt and .pdf files, extracts and splits them in parallel
+worker processes, and streams the chunks into batched embedding requests and
+Qdrant upserts. Completed files are appended to a checkpoint manifest so an
+interrupted run resumes where it stopped.
+
+Usage:
+    python -m backend.indexer data/ more-data/ --workers 8 --checkpoint index.ckpt.jsonl
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from qdrant_client.http import models
+
+from backend.core.text_utils import (
+    CharacterTextSplitter,
+    iter_corpus_files,
+    load_file_documents,
+)
+from backend.core.vectordatabase import SOURCE_FIELD, BulkWriter, VectorDatabase
+
+# Namespace for deterministic chunk IDs, so re-indexing a file overwrites its
+# previous points instead of duplicating them.
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1c2f0e-4f51-4b0c-9a43-0b8f6d7f5a11")
+
+CHECKPOINT_VERSION = 1
+
+
+def chunk_id(path: str, index: int) -> str:
+    """Deterministic Qdrant point ID for chunk ``index`` of ``path``."""
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{path}:{index}"))
+
+
+def file_fingerprint(path: str) -> Dict[str, int]:
+    """Size and modification time used to detect files changed since indexing."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _extract_chunks(
+    path: str, chunk_size: int, chunk_overlap: int
+) -> Tuple[str, List[str], Optional[str]]:
+    """Worker: load and split one file. Returns (path, chunks, error)."""
+    try:
+        documents = load_file_documents(path)
+        splitter = CharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        return path, splitter.split_texts(documents), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def _imap_bounded(
+    executor: Executor, fn: Callable, items: Iterable[Any], max_in_flight: int
+) -> Iterator[Any]:
+    """
+    Like ``executor.map`` but submits lazily, keeping at most ``max_in_flight``
+    tasks queued so extracted text does not pile up in memory.
+    """
+    in_flight = deque()
+    for item in items:
+        in_flight.append(executor.submit(fn, item))
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+class IndexCheckpoint:
+    """
+    Append-only JSON-lines manifest of fully indexed files.
+
+    The first line is a header identifying the collection and embedding model;
+    every following line records one file whose chunks have all been upserted.
+    A torn final line from a crash is ignored on load.
+    """
+
+    def __init__(self, path: str, collection: str, model_id: str, restart: bool = False):
+        self.path = path
+        self.collection = collection
+        self.model_id = model_id
+        self.completed: Dict[str, Dict[str, int]] = {}
+
+        if restart and os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(path):
+            self._load()
+            self._file = open(path, "a", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+            self._write({
+                "version": CHECKPOINT_VERSION,
+                "collection": collection,
+                "model_id": model_id,
+            })
+            self.sync()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines:
+            raise ValueError(f"Checkpoint {self.path} is empty; use --restart to rebuild it")
+
+        header = json.loads(lines[0])
+        if (header.get("collection"), header.get("model_id")) != (self.collection, self.model_id):
+            raise ValueError(
+                f"Checkpoint {self.path} was written for collection "
+                f"'{header.get('collection')}' with model '{header.get('model_id')}'; "
+                "use --restart or a different --checkpoint path"
+            )
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.completed[record["path"]] = record["fingerprint"]
+
+    def _write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record) + "\n")
+
+    def is_done(self, path: str, fingerprint: Dict[str, int]) -> bool:
+        return self.completed.get(path) == fingerprint
+
+    def mark_done(self, path: str, fingerprint: Dict[str, int], chunks: int):
+        self.completed[path] = fingerprint
+        self._write({"path": path, "fingerprint": fingerprint, "chunks": chunks})
+
+    def sync(self):
+        """Flush recorded files to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+
+class ProgressReporter:
+    """Prints progress and throughput at most once per ``interval`` seconds."""
+
+    def __init__(self, total_files: int, interval: float = 5.0):
+        self.total_files = total_files
+        self.interval = interval
+        self.files_done = 0
+        self.files_failed = 0
+        self.chunks_indexed = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+
+    def update(self, files: int = 0, failed: int = 0, chunks: int = 0):
+        self.files_done += files
+        self.files_failed += failed
+        self.chunks_indexed += chunks
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self, final: bool = False):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        files_per_sec = self.files_done / elapsed
+        remaining = self.total_files - self.files_done - self.files_failed
+        eta = f"{remaining / files_per_sec:.0f}s" if files_per_sec > 0 else "?"
+        prefix = "[INDEX] done:" if final else "[INDEX]"
+        print(
+            f"{prefix} {self.files_done}/{self.total_files} files "
+            f"({self.files_failed} failed), {self.chunks_indexed} chunks | "
+            f"{files_per_sec:.1f} files/s, {self.chunks_indexed / elapsed:.1f} chunks/s | "
+            f"elapsed {elapsed:.0f}s" + ("" if final else f", eta {eta}"),
+            flush=True,
+        )
+
+
+class CorpusIndexer:
+    """
+    Streams files through parallel extraction into batched embedding and upserts.
+
+    Parameters
+    ----------
+    vector_db : VectorDatabase
+        Target database.
+    checkpoint : IndexCheckpoint
+        Manifest of completed files; a file is recorded only once every one of
+        its chunks has been upserted.
+    batch_size : int
+        Number of chunks buffered before they are embedded and handed to the
+        bulk writer.
+    checkpoint_every : int
+        Chunks written between consistency barriers; files completed since the
+        previous barrier are only checkpointed once the barrier confirms Qdrant
+        has applied their points.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDatabase,
+        checkpoint: IndexCheckpoint,
+        batch_size: int = 256,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 30,
+        workers: Optional[int] = None,
+        progress_interval: float = 5.0,
+        checkpoint_every: int = 4096,
+    ):
+        self.vector_db = vector_db
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = workers or os.cpu_count() or 1
+        self.progress_interval = progress_interval
+        self.checkpoint_every = checkpoint_every
+
+        self._texts: List[str] = []
+        self._ids: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._owners: List[str] = []
+        self._remaining: Dict[str, int] = {}
+        self._totals: Dict[str, int] = {}
+        self._fingerprints: Dict[str, Dict[str, int]] = {}
+        self._unsynced: List[Tuple[str, int]] = []
+        self._since_commit = 0
+        self._writer: Optional[BulkWriter] = None
+        self.progress: Optional[ProgressReporter] = None
+
+    def run(self, paths: Iterable[str]) -> ProgressReporter:
+        """Index every supported file under ``paths`` that is not yet checkpointed."""
+        pending = []
+        skipped = 0
+        for root in paths:
+            for path in iter_corpus_files(root):
+                path = os.path.abspath(path)
+                if path in self._fingerprints:
+                    # Reached again through an overlapping input path
+                    continue
+                fingerprint = file_fingerprint(path)
+                if self.checkpoint.is_done(path, fingerprint):
+                    skipped += 1
+                    continue
+                if path in self.checkpoint.completed:
+                    # Changed since it was indexed: drop its old chunks first
+                    self._delete_file_points(path)
+                self._fingerprints[path] = fingerprint
+                pending.append(path)
+
+        print(f"[INDEX] {len(pending)} files to index, {skipped} already checkpointed")
+        self.progress = ProgressReporter(len(pending), self.progress_interval)
+
+        extract = partial(
+            _extract_chunks, chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+        )
+        try:
+            # One writer for the whole run keeps HNSW indexing deferred until the end
+            with self.vector_db.bulk_writer() as writer, \
+                    ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self._writer = writer
+                for path, chunks, error in _imap_bounded(
+                    executor, extract, pending, max_in_flight=self.workers * 4
+                ):
+                    if error:
+                        print(f"[INDEX] failed to read {path}: {error}")
+                        self.progress.update(failed=1)
+                        continue
+                    self._add_file(path, chunks)
+                self._flush()
+                self._commit()
+        finally:
+            self._writer = None
+            self.checkpoint.close()
+        self.progress.report(final=True)
+        return self.progress
+
+    def _add_file(self, path: str, chunks: List[str]):
+        if not chunks:
+            self._complete(path, 0)
+            return
+
+        self._remaining[path] = self._totals[path] = len(chunks)
+        for index, text in enumerate(chunks):
+            self._texts.append(text)
+            self._ids.append(chunk_id(path, index))
+            self._payloads.append({SOURCE_FIELD: path, "chunk": index})
+            self._owners.append(path)
+            if len(self._texts) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._texts:
+            return
+
+        self.vector_db.upsert_texts(
+            self._texts, ids=self._ids, payloads=self._payloads, writer=self._writer
+        )
+        flushed = len(self._texts)
+        for owner in self._owners:
+            self._remaining[owner] -= 1
+            if self._remaining[owner] == 0:
+                del self._remaining[owner]
+                self._complete(owner, self._totals.pop(owner))
+        self.progress.update(chunks=flushed)
+
+        self._texts, self._ids, self._payloads, self._owners = [], [], [], []
+        self._since_commit += flushed
+        if self._since_commit >= self.checkpoint_every:
+            self._commit()
+
+    def _complete(self, path: str, chunks: int):
+        self._unsynced.append((path, chunks))
+        self.progress.update(files=1)
+
+    def _commit(self):
+        """Wait for Qdrant to apply all writes, then checkpoint completed files."""
+        self._writer.sync()
+        for path, chunks in self._unsynced:
+            self.checkpoint.mark_done(path, self._fingerprints.pop(path), chunks)
+        self.checkpoint.sync()
+        self._unsynced = []
+        self._since_commit = 0
+
+    def _delete_file_points(self, path: str):
+        self.vector_db.client.delete(
+            collection_name=self.vector_db.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[models.FieldCondition(
+                        key=SOURCE_FIELD, match=models.MatchValue(value=path)
+                    )]
+                )
+            ),
+        )
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Bulk-index .txt and .pdf corpora into Qdrant")
+    parser.add_argument("paths", nargs="+", help="Files or directories to index")
+    parser.add_argument(
+        "--checkpoint", default=".index_checkpoint.jsonl",
+        help="Checkpoint manifest path (default: .index_checkpoint.jsonl)",
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore and overwrite the checkpoint")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Parallel file readers (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=256,
+        help="Chunks buffered per embedding/upsert flush (default: 256)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=30)
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=4096,
+        help="Chunks between consistency barriers and checkpoint writes (default: 4096)",
+    )
+    parser.add_argument(
+        "--progress-interval", type=float, default=5.0,
+        help="Seconds between progress reports (default: 5)",
+    )
+    args = parser.parse_args()
+
+    vector_db = VectorDatabase()
+    checkpoint = IndexCheckpoint(
+        args.checkpoint,
+        collection=vector_db.collection_name,
+        model_id=vector_db.embedding_provider.model_id,
+        restart=args.restart,
+    )
+    indexer = CorpusIndexer(
+        vector_db,
+        checkpoint,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        workers=args.workers,
+        progress_interval=args.progress_interval,
+        checkpoint_every=args.checkpoint_every,
+    )
+    indexer.run(args.paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,33 @@
 import os
 import json
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from backend.api import router as api_router
+from backend.core.admission import AdmissionMiddleware, admission_controller
+from backend.core.chatmodel import ChatModel
+from backend.core.embeddings import EmbeddingProvider
+from backend.core.warmup import endpoint_warmer
 from dotenv import load_dotenv
 from starlette.requests import Request
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Wake scale-to-zero HF endpoints in the background; /api/ready reports
+    # ready once they have answered a warm-up request
+    endpoint_warmer.register("llm", ChatModel().warmup)
+    embedding_provider = EmbeddingProvider()
+    if embedding_provider.backend_name == "huggingface":
+        # Local backends such as "hashing" have no endpoint to keep warm
+        endpoint_warmer.register("embedding", lambda: embedding_provider.embed_query("ping"))
+    await endpoint_warmer.start()
+    yield
+    await endpoint_warmer.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware to allow frontend to talk to the backend
 allowed_origins_env = os.getenv("ALLOWED_ORIGINS")
@@ -28,12 +46,18 @@ else:
         "http://127.0.0.1:7860",
     ]
 
+# Admission control for /api/ask and /api/upload. Added before CORS so that
+# shed responses (429/503) still carry CORS headers.
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read the session headers set by /api/ask
+    expose_headers=["X-Session-Id", "X-Retrieval-Reused"],
 )
 
 # Request logging middleware (optional)
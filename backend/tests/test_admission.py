@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from backend.core.admission import INTERACTIVE, UPLOAD, AdmissionController, AdmissionRejected
+
+
+def make_controller(monkeypatch, **env):
+    settings = {
+        "ADMISSION_MAX_CONCURRENCY": "1",
+        "ADMISSION_ASK_CONCURRENCY": "1",
+        "ADMISSION_UPLOAD_CONCURRENCY": "1",
+        "ADMISSION_QUEUE_SIZE": "4",
+        "ADMISSION_QUEUE_TIMEOUT": "5",
+        "ADMISSION_RETRY_AFTER": "2",
+    }
+    settings.update(env)
+    for name, value in settings.items():
+        monkeypatch.setenv(name, value)
+    return AdmissionController()
+
+
+async def settle():
+    # Let queued acquire() calls reach their wait
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_zero_queue_sheds_immediately(monkeypatch):
+    controller = make_controller(monkeypatch, ADMISSION_QUEUE_SIZE="0")
+
+    async def scenario():
+        await controller.acquire(INTERACTIVE)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(INTERACTIVE)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.retry_after == 2
+    assert controller.lanes[INTERACTIVE].rejected == 1
+
+
+def test_freed_slot_goes_to_highest_priority_waiter(monkeypatch):
+    controller = make_controller(monkeypatch)
+    order = []
+
+    async def wait_for(lane, tag):
+        await controller.acquire(lane)
+        order.append(tag)
+
+    async def scenario():
+        await controller.acquire(UPLOAD)
+        upload = asyncio.create_task(wait_for(UPLOAD, "upload"))
+        await settle()
+        ask = asyncio.create_task(wait_for(INTERACTIVE, "ask"))
+        await settle()
+
+        controller.release(UPLOAD)
+        await settle()
+        assert order == ["ask"]
+        controller.release(INTERACTIVE)
+        await asyncio.gather(upload, ask)
+
+    asyncio.run(scenario())
+    assert order == ["ask", "upload"]
+
+
+def test_full_queue_evicts_lower_priority_waiter(monkeypatch):
+    controller = make_controller(monkeypatch, ADMISSION_QUEUE_SIZE="1")
+
+    async def scenario():
+        await controller.acquire(INTERACTIVE)
+        upload = asyncio.create_task(controller.acquire(UPLOAD))
+        await settle()
+        ask = asyncio.create_task(controller.acquire(INTERACTIVE))
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as evicted:
+            await upload
+        # Same priority as the queued ask, so it cannot displace it
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(INTERACTIVE)
+
+        controller.release(INTERACTIVE)
+        await ask
+        return evicted.value, rejected.value
+
+    evicted, rejected = asyncio.run(scenario())
+    assert evicted.status_code == 429
+    assert rejected.status_code == 429
+    assert controller.lanes[UPLOAD].evicted == 1
+    assert controller.lanes[INTERACTIVE].rejected == 1
+    assert controller.in_flight == 1
+
+
+def test_queue_timeout_returns_503(monkeypatch):
+    controller = make_controller(monkeypatch, ADMISSION_QUEUE_TIMEOUT="0.05")
+
+    async def scenario():
+        await controller.acquire(INTERACTIVE)
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await controller.acquire(INTERACTIVE)
+        return timed_out.value
+
+    timed_out = asyncio.run(scenario())
+    assert timed_out.status_code == 503
+    assert controller.lanes[INTERACTIVE].timed_out == 1
+    assert controller.snapshot()["queue_depth"] == 0
+
+
+def test_cancelled_waiter_leaves_queue(monkeypatch):
+    controller = make_controller(monkeypatch)
+
+    async def scenario():
+        await controller.acquire(INTERACTIVE)
+        waiter = asyncio.create_task(controller.acquire(INTERACTIVE))
+        await settle()
+        assert controller.snapshot()["queue_depth"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+    assert controller.snapshot()["queue_depth"] == 0
+    assert controller.lanes[INTERACTIVE].queued == 0
+    assert controller.in_flight == 1
+
+
+def test_cancel_after_grant_releases_slot(monkeypatch):
+    controller = make_controller(monkeypatch)
+
+    async def scenario():
+        await controller.acquire(INTERACTIVE)
+        waiter = asyncio.create_task(controller.acquire(INTERACTIVE))
+        await settle()
+
+        # Slot handed over, but the client disconnects before it resumes
+        controller.release(INTERACTIVE)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert controller.lanes[INTERACTIVE].in_flight == 0
@@ -0,0 +1,99 @@
+import os
+
+from backend.indexer import CorpusIndexer, IndexCheckpoint, chunk_id
+
+
+class FakeWriter:
+    def __init__(self):
+        self.syncs = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sync()
+
+    def sync(self):
+        self.syncs += 1
+
+
+class FakeClient:
+    def __init__(self):
+        self.deletes = []
+
+    def delete(self, collection_name, points_selector):
+        self.deletes.append(points_selector)
+
+
+class FakeVectorDatabase:
+    """Records upserted points instead of embedding them into Qdrant."""
+
+    collection_name = "test"
+
+    def __init__(self):
+        self.client = FakeClient()
+        self.points = {}
+
+    def bulk_writer(self, **kwargs):
+        return FakeWriter()
+
+    def upsert_texts(self, texts, ids, payloads=None, batch_size=32, writer=None):
+        for point_id, text, payload in zip(ids, texts, payloads):
+            self.points[point_id] = dict(payload, text=text)
+
+
+def make_corpus(root):
+    os.makedirs(os.path.join(root, "sub"))
+    with open(os.path.join(root, "a.txt"), "w") as f:
+        f.write("alpha " * 400)
+    with open(os.path.join(root, "sub", "b.txt"), "w") as f:
+        f.write("beta " * 400)
+
+
+def run_indexer(vector_db, checkpoint_path, paths):
+    checkpoint = IndexCheckpoint(str(checkpoint_path), "test", "fake-model")
+    indexer = CorpusIndexer(
+        vector_db, checkpoint, batch_size=3, chunk_size=200, chunk_overlap=0,
+        workers=1, checkpoint_every=4
+    )
+    return indexer.run(paths)
+
+
+def test_overlapping_paths_index_each_file_once(tmp_path):
+    corpus = tmp_path / "corpus"
+    make_corpus(str(corpus))
+    vector_db = FakeVectorDatabase()
+
+    progress = run_indexer(
+        vector_db,
+        tmp_path / "ckpt.jsonl",
+        [str(corpus), str(corpus / "sub"), str(corpus / "a.txt")],
+    )
+
+    assert progress.files_done == 2
+    assert progress.files_failed == 0
+    sources = {payload["source"] for payload in vector_db.points.values()}
+    assert sources == {str(corpus / "a.txt"), str(corpus / "sub" / "b.txt")}
+    assert progress.chunks_indexed == len(vector_db.points)
+
+    checkpoint = IndexCheckpoint(str(tmp_path / "ckpt.jsonl"), "test", "fake-model")
+    assert set(checkpoint.completed) == sources
+    checkpoint.close()
+
+
+def test_rerun_skips_checkpointed_files(tmp_path):
+    corpus = tmp_path / "corpus"
+    make_corpus(str(corpus))
+    run_indexer(FakeVectorDatabase(), tmp_path / "ckpt.jsonl", [str(corpus)])
+
+    vector_db = FakeVectorDatabase()
+    progress = run_indexer(vector_db, tmp_path / "ckpt.jsonl", [str(corpus)])
+
+    assert progress.files_done == 0
+    assert vector_db.points == {}
+    assert vector_db.client.deletes == []
+
+
+def test_chunk_ids_are_stable_per_path():
+    assert chunk_id("/data/a.txt", 0) == chunk_id("/data/a.txt", 0)
+    assert chunk_id("/data/a.txt", 0) != chunk_id("/data/a.txt", 1)
@@ -0,0 +1,52 @@
+import pytest
+from qdrant_client import QdrantClient
+
+from backend.core.chunk_store import ChunkStore
+from backend.core.embeddings import EmbeddingProvider
+from backend.core.vectordatabase import VectorDatabase, retrieval_stats
+
+
+def make_vector_db(client, chunk_store=None):
+    """VectorDatabase on a local in-memory Qdrant with the hashing backend."""
+    vector_db = VectorDatabase.__new__(VectorDatabase)
+    vector_db.embedding_provider = EmbeddingProvider("hashing")
+    vector_db.collection_name = "test"
+    vector_db.vector_size = vector_db.embedding_provider.dimension
+    vector_db.client = client
+    vector_db.chunk_store = chunk_store
+    vector_db.defer_indexing_min_points = 10 ** 9
+    vector_db._ensure_collection_exists()
+    return vector_db
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("HASHING_EMBEDDING_DIMENSION", "64")
+    return QdrantClient(location=":memory:")
+
+
+def test_chunk_store_keeps_text_out_of_payload(client, tmp_path):
+    store = ChunkStore(str(tmp_path))
+    vector_db = make_vector_db(client, store)
+    vector_db.upsert_texts(["corn grows in iowa", "baseball in the corn"], ids=[1, 2])
+
+    assert client.retrieve("test", ids=[1], with_payload=True)[0].payload == {}
+    results = vector_db.search_by_text("corn grows in iowa", k=1)
+    assert results[0][0] == "corn grows in iowa"
+    store.close()
+
+
+def test_hits_without_text_are_reported(client, tmp_path, capsys):
+    # Indexed with a chunk store the searching process does not have
+    store = ChunkStore(str(tmp_path))
+    make_vector_db(client, store).upsert_texts(["corn grows in iowa"], ids=[7])
+    store.close()
+    before = retrieval_stats.snapshot()["hits_missing_text"]
+
+    results = make_vector_db(client).search_by_text("corn", k=1)
+
+    assert results == []
+    stats = retrieval_stats.snapshot()
+    assert stats["hits_missing_text"] == before + 1
+    assert stats["recent_missing_ids"][-1] == "7"
+    assert "have no text" in capsys.readouterr().out
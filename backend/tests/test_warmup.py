@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+from backend.core.warmup import READY, WARMING, EndpointWarmer
+
+
+def make_warmer(monkeypatch, **env):
+    settings = {
+        "WARMER_ENABLED": "true",
+        "WARMER_INTERVAL_SECONDS": "60",
+        "WARMER_RETRY_SECONDS": "0.01",
+        "WARMER_COLD_START_SECONDS": "10",
+    }
+    settings.update(env)
+    for name, value in settings.items():
+        monkeypatch.setenv(name, value)
+    return EndpointWarmer()
+
+
+def test_observe_error_from_worker_thread_wakes_warmer(monkeypatch):
+    warmer = make_warmer(monkeypatch)
+    pings = []
+    wake_threads = []
+    warmer.register("embedding", lambda: pings.append(1))
+
+    async def scenario():
+        await warmer.start()
+        while not warmer.ready:
+            await asyncio.sleep(0.01)
+        assert warmer.endpoints["embedding"].status == READY
+
+        # asyncio.Event must only be touched from the loop's own thread
+        loop_thread = threading.get_ident()
+        set_event = warmer._wake.set
+
+        def record_set():
+            wake_threads.append(threading.get_ident() == loop_thread)
+            set_event()
+
+        warmer._wake.set = record_set
+
+        # /api/ask reports cold starts from asyncio.to_thread retrieval
+        error = RuntimeError("503 Service Unavailable: model is loading")
+        await asyncio.to_thread(warmer.observe_error, "embedding", error)
+        assert warmer.is_warming("embedding")
+
+        # Without the wake-up the next ping would wait the full 60s interval
+        await asyncio.wait_for(_until_ready(warmer, "embedding"), timeout=2)
+        await warmer.stop()
+
+    asyncio.run(scenario())
+    assert wake_threads == [True]
+    assert len(pings) == 2
+    assert warmer.endpoints["embedding"].cold_starts == 1
+
+
+def test_observe_error_ignores_non_cold_start_errors(monkeypatch):
+    warmer = make_warmer(monkeypatch)
+    warmer.register("llm", lambda: None)
+
+    warmer.observe_error("llm", ValueError("bad prompt"))
+    warmer.observe_error("unknown", RuntimeError("503"))
+
+    assert warmer.endpoints["llm"].status != WARMING
+    assert warmer.endpoints["llm"].cold_starts == 0
+
+
+async def _until_ready(warmer, name):
+    while warmer.endpoints[name].status != READY:
+        await asyncio.sleep(0.01)
@@ -5,6 +5,23 @@ export default function ChatBox() {
   const [question, setQuestion] = useState('')
   const [messages, setMessages] = useState([])
   const [isStreaming, setIsStreaming] = useState(false)
+  const [sessionId, setSessionId] = useState(null)
+
+  // Conversation session so follow-up questions keep their history and context.
+  // Falls back to stateless asks if a session cannot be created.
+  const ensureSession = async () => {
+    if (sessionId) return sessionId
+    try {
+      const res = await fetch(`${getApiUrl()}/api/sessions`, { method: 'POST' })
+      if (!res.ok) return null
+      const data = await res.json()
+      setSessionId(data.session_id)
+      return data.session_id
+    } catch (error) {
+      console.error('Could not create session:', error)
+      return null
+    }
+  }
 
   const askQuestion = async (e) => {
     e.preventDefault()
@@ -20,6 +37,10 @@ export default function ChatBox() {
     try {
       const formData = new FormData()
       formData.append('question', question)
+      const activeSessionId = await ensureSession()
+      if (activeSessionId) {
+        formData.append('session_id', activeSessionId)
+      }
 
       const res = await fetch(`${getApiUrl()}/api/ask`, {
         method: 'POST',
@@ -29,6 +50,12 @@ export default function ChatBox() {
         },
       })
 
+      // The server starts a new session if ours expired; keep whichever it used
+      const returnedSessionId = res.headers.get('X-Session-Id')
+      if (returnedSessionId && returnedSessionId !== activeSessionId) {
+        setSessionId(returnedSessionId)
+      }
+
       if (!res.ok) {
         const errorData = await res.json()
         throw new Error(errorData.error || `HTTP error! status: ${res.status}`)